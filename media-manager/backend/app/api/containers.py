@@ -3,9 +3,12 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.api.routing import SerializedRoute
+from app.cache import CONTAINER_STATS_KEY, cached
 from app.database import get_db
 from app.schemas.container import (
     ContainerCreate,
@@ -16,7 +19,7 @@ from app.schemas.container import (
 )
 from app.services.container_service import ContainerService
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -25,15 +28,16 @@ def get_container_service(db: Session = Depends(get_db)) -> ContainerService:
     return ContainerService(db)
 
 
-@router.post("/", response_model=ContainerResponse, status_code=201)
-async def create_container(
+@router.post("/", response_model=ContainerResponse, status_code=202)
+def create_container(
     data: ContainerCreate,
     service: ContainerService = Depends(get_container_service),
 ):
     """
     Create a container from a URL (FileCrypt.cc, etc.).
 
-    Automatically extracts all download links and creates downloads.
+    Link extraction runs in a background worker; the container is returned
+    with status "extracting" and switches to "active" once its downloads exist.
 
     - **url**: Container URL (e.g., https://filecrypt.cc/Container/XXX.html)
     - **premium_account_id**: Optional premium account to use for all downloads
@@ -49,12 +53,12 @@ async def create_container(
         )
         return container
     except Exception as e:
-        logger.error(f"Failed to create container: {e}")
+        logger.error("Failed to create container: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/manual", response_model=ContainerResponse, status_code=201)
-async def create_container_manual(
+@router.post("/manual", response_model=ContainerResponse, status_code=202)
+def create_container_manual(
     data: ContainerCreateManual,
     service: ContainerService = Depends(get_container_service),
 ):
@@ -63,6 +67,9 @@ async def create_container_manual(
 
     Perfect for when you already have the download links (e.g., copied from FileCrypt.cc).
 
+    The downloads are added in a background worker; the container is returned
+    with status "queued_submission" and switches to "active" once they exist.
+
     - **name**: Container name (e.g., "Movie Pack", "Season 1")
     - **urls**: List of download URLs (RapidGator, DDownload, etc.)
     - **folder_name**: Optional custom folder for downloads
@@ -79,15 +86,16 @@ async def create_container_manual(
         )
         return container
     except Exception as e:
-        logger.error(f"Failed to create manual container: {e}")
+        logger.error("Failed to create manual container: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/", response_model=List[ContainerResponse])
-async def list_containers(
+def list_containers(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header"),
     service: ContainerService = Depends(get_container_service),
 ):
     """
@@ -95,20 +103,22 @@ async def list_containers(
 
     - **status**: Filter by status (pending, active, completed, failed)
     - **limit**: Maximum number of results (1-1000)
-    - **offset**: Offset for pagination
+    - **cursor**: Opaque cursor returned in the ``X-Next-Cursor`` header of the previous page
     """
-    containers = service.list_containers(status=status, limit=limit, offset=offset)
-
-    # Update status for active containers
-    for container in containers:
-        if container.status in ["active", "pending"]:
-            service.update_container_status(container.id)
-
+    containers = service.list_containers(
+        status=status,
+        limit=limit,
+        before_id=decode_cursor(cursor),
+        refresh_active=True,
+    )
+    if len(containers) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(containers[-1].id)
     return containers
 
 
 @router.get("/stats", response_model=ContainerStats)
-async def get_container_stats(
+@cached(CONTAINER_STATS_KEY, ttl=5)
+def get_container_stats(
     service: ContainerService = Depends(get_container_service),
 ):
     """
@@ -116,25 +126,11 @@ async def get_container_stats(
 
     Returns counts of containers by status.
     """
-    from app.models.container import Container
-
-    db = service.db
+    return service.get_stats()
 
-    total = db.query(Container).count()
-    active = db.query(Container).filter(Container.status == "active").count()
-    completed = db.query(Container).filter(Container.status == "completed").count()
-    failed = db.query(Container).filter(Container.status == "failed").count()
 
-    return {
-        "total_containers": total,
-        "active_containers": active,
-        "completed_containers": completed,
-        "failed_containers": failed,
-    }
-
-
-@router.get("/{container_id}")
-async def get_container(
+@router.get("/{container_id}", response_model=ContainerWithDownloads)
+def get_container(
     container_id: int,
     service: ContainerService = Depends(get_container_service),
 ):
@@ -143,38 +139,18 @@ async def get_container(
 
     - **container_id**: Container ID
     """
-    from app.schemas.download import DownloadResponse
-
-    container = service.get_container(container_id)
+    container = service.get_container(container_id, with_downloads=True)
     if not container:
         raise HTTPException(status_code=404, detail="Container not found")
 
     # Update status
     service.update_container_status(container_id)
 
-    # Serialize downloads manually
-    downloads = [DownloadResponse.model_validate(d) for d in container.downloads]
-
-    return {
-        "id": container.id,
-        "name": container.name,
-        "url": container.url,
-        "source": container.source,
-        "folder_name": container.folder_name,
-        "status": container.status,
-        "total_links": container.total_links,
-        "completed_links": container.completed_links,
-        "failed_links": container.failed_links,
-        "description": container.description,
-        "password": container.password,
-        "created_at": container.created_at,
-        "updated_at": container.updated_at,
-        "downloads": downloads,
-    }
+    return container
 
 
 @router.delete("/{container_id}", status_code=204)
-async def delete_container(
+def delete_container(
     container_id: int,
     service: ContainerService = Depends(get_container_service),
 ):
@@ -3,10 +3,14 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from app.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.api.routing import SerializedRoute
+from app.cache import DOWNLOAD_STATS_KEY, cached
 from app.database import get_db
+from app.models import DownloadStatus
 from app.schemas.download import (
     DownloadActionResponse,
     DownloadBulkCreate,
@@ -14,9 +18,9 @@ from app.schemas.download import (
     DownloadResponse,
     DownloadStats,
 )
-from app.services.download_service import DownloadService
+from app.services.download_service import ACTIVE_DOWNLOAD_STATUSES, DownloadService
 
-router = APIRouter()
+router = APIRouter(route_class=SerializedRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -26,7 +30,7 @@ def get_download_service(db: Session = Depends(get_db)) -> DownloadService:
 
 
 @router.post("/", response_model=DownloadResponse, status_code=201)
-async def add_download(
+def add_download(
     data: DownloadCreate,
     service: DownloadService = Depends(get_download_service),
 ):
@@ -43,12 +47,12 @@ async def add_download(
         )
         return download
     except Exception as e:
-        logger.error(f"Failed to add download: {e}")
+        logger.error("Failed to add download: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/bulk", response_model=List[DownloadResponse], status_code=201)
-async def add_downloads_bulk(
+def add_downloads_bulk(
     data: DownloadBulkCreate,
     service: DownloadService = Depends(get_download_service),
 ):
@@ -58,26 +62,22 @@ async def add_downloads_bulk(
     - **urls**: List of URLs to download
     - **premium_account_id**: Optional premium account to use for all
     """
-    downloads = []
-    for url in data.urls:
-        try:
-            download = service.add_download(
-                url=url,
-                premium_account_id=data.premium_account_id,
-            )
-            downloads.append(download)
-        except Exception as e:
-            logger.error(f"Failed to add download {url}: {e}")
-            # Continue with other downloads
-
-    return downloads
+    try:
+        return service.bulk_add_downloads(
+            urls=data.urls,
+            premium_account_id=data.premium_account_id,
+        )
+    except Exception as e:
+        logger.error("Failed to add downloads: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/", response_model=List[DownloadResponse])
-async def list_downloads(
-    status: Optional[str] = Query(None, description="Filter by status"),
+def list_downloads(
+    response: Response,
+    status: Optional[DownloadStatus] = Query(None, description="Filter by status"),
     limit: int = Query(100, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header"),
     service: DownloadService = Depends(get_download_service),
 ):
     """
@@ -85,20 +85,27 @@ async def list_downloads(
 
     - **status**: Filter by status (pending, queued, downloading, completed, failed, etc.)
     - **limit**: Maximum number of results (1-1000)
-    - **offset**: Offset for pagination
+    - **cursor**: Opaque cursor returned in the ``X-Next-Cursor`` header of the previous page
     """
-    downloads = service.list_downloads(status=status, limit=limit, offset=offset)
+    downloads = service.list_downloads(
+        status=status,
+        limit=limit,
+        before_id=decode_cursor(cursor),
+    )
+    if len(downloads) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(downloads[-1].id)
 
     # Update status from aria2c for active downloads
-    for download in downloads:
-        if download.status in ["queued", "downloading", "paused"]:
-            service.update_download_status(download.id)
+    service.refresh_statuses(
+        [d for d in downloads if d.status in ACTIVE_DOWNLOAD_STATUSES]
+    )
 
     return downloads
 
 
 @router.get("/stats", response_model=DownloadStats)
-async def get_download_stats(
+@cached(DOWNLOAD_STATS_KEY, ttl=5)
+def get_download_stats(
     service: DownloadService = Depends(get_download_service),
 ):
     """
@@ -111,7 +118,7 @@ async def get_download_stats(
 
 
 @router.get("/{download_id}", response_model=DownloadResponse)
-async def get_download(
+def get_download(
     download_id: int,
     service: DownloadService = Depends(get_download_service),
 ):
@@ -125,14 +132,14 @@ async def get_download(
         raise HTTPException(status_code=404, detail="Download not found")
 
     # Update status from aria2c if active
-    if download.status in ["queued", "downloading", "paused"]:
+    if download.status in ACTIVE_DOWNLOAD_STATUSES:
         service.update_download_status(download_id)
 
     return download
 
 
 @router.post("/{download_id}/pause", response_model=DownloadActionResponse)
-async def pause_download(
+def pause_download(
     download_id: int,
     service: DownloadService = Depends(get_download_service),
 ):
@@ -154,7 +161,7 @@ async def pause_download(
 
 
 @router.post("/{download_id}/resume", response_model=DownloadActionResponse)
-async def resume_download(
+def resume_download(
     download_id: int,
     service: DownloadService = Depends(get_download_service),
 ):
@@ -176,7 +183,7 @@ async def resume_download(
 
 
 @router.post("/{download_id}/cancel", response_model=DownloadActionResponse)
-async def cancel_download(
+def cancel_download(
     download_id: int,
     service: DownloadService = Depends(get_download_service),
 ):
@@ -198,7 +205,7 @@ async def cancel_download(
 
 
 @router.post("/{download_id}/retry", response_model=DownloadActionResponse)
-async def retry_download(
+def retry_download(
     download_id: int,
     service: DownloadService = Depends(get_download_service),
 ):
@@ -219,7 +226,7 @@ async def retry_download(
 
 
 @router.delete("/{download_id}", status_code=204)
-async def delete_download(
+def delete_download(
     download_id: int,
     service: DownloadService = Depends(get_download_service),
 ):
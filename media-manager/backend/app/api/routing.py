@@ -0,0 +1,74 @@
+"""Custom API route classes."""
+
+import asyncio
+import functools
+from typing import Any, Callable, Optional
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+
+class SerializedRoute(APIRoute):
+    """
+    Route that serializes its response model with a precompiled TypeAdapter.
+
+    The adapter is built once when the route is registered. Endpoint results
+    (ORM objects, dicts or models) are validated and dumped straight to JSON
+    bytes by pydantic-core, skipping FastAPI's per-request response field
+    validation and the second encoding pass in the response class.
+
+    Headers and status codes set on an injected ``Response`` parameter are
+    carried over. Routes that customise the response model output
+    (include/exclude/unset options) keep FastAPI's default path.
+    """
+
+    def get_route_handler(self) -> Callable:
+        if self._can_precompile():
+            self.dependant.call = self._wrap_endpoint(self.dependant.call)
+        return super().get_route_handler()
+
+    def _can_precompile(self) -> bool:
+        return (
+            self.response_model is not None
+            and self.response_model_include is None
+            and self.response_model_exclude is None
+            and self.response_model_by_alias
+            and not self.response_model_exclude_unset
+            and not self.response_model_exclude_defaults
+            and not self.response_model_exclude_none
+        )
+
+    def _wrap_endpoint(self, call: Callable) -> Callable:
+        adapter = TypeAdapter(self.response_model)
+        status_code = self.status_code or 200
+        media_type = "application/json"
+        response_param = self.dependant.response_param_name
+
+        def render(result: Any, sub_response: Optional[Response]) -> Any:
+            if isinstance(result, Response):
+                return result
+            content = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+            response = Response(
+                content=content,
+                status_code=(sub_response and sub_response.status_code) or status_code,
+                media_type=media_type,
+            )
+            if sub_response is not None:
+                response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        if asyncio.iscoroutinefunction(call):
+            @functools.wraps(call)
+            async def async_endpoint(*args: Any, **kwargs: Any) -> Any:
+                result = await call(*args, **kwargs)
+                return render(result, kwargs.get(response_param) if response_param else None)
+
+            return async_endpoint
+
+        @functools.wraps(call)
+        def endpoint(*args: Any, **kwargs: Any) -> Any:
+            result = call(*args, **kwargs)
+            return render(result, kwargs.get(response_param) if response_param else None)
+
+        return endpoint
@@ -0,0 +1,146 @@
+"""Redis-backed cache for frequently polled, read-mostly endpoints."""
+
+import functools
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cache keys
+CONTAINER_STATS_KEY = "containers:stats"
+DOWNLOAD_STATS_KEY = "downloads:stats"
+ARIA2_STATUS_KEY = "aria2:status:{gid}"
+
+# Seconds to bypass Redis after a connection error
+_RETRY_INTERVAL = 30.0
+
+_client: Optional[redis.Redis] = None
+_retry_at = 0.0
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Get or create the Redis client.
+
+    Returns:
+        Redis client, or None while Redis is considered unavailable
+    """
+    global _client
+    if time.monotonic() < _retry_at:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+    return _client
+
+
+def _mark_unavailable(e: Exception) -> None:
+    """Stop using Redis for a while after a failure."""
+    global _retry_at
+    _retry_at = time.monotonic() + _RETRY_INTERVAL
+    logger.warning("Redis unavailable, caching disabled for %.0fs: %s", _RETRY_INTERVAL, e)
+
+
+def cached(key: str, ttl: int = 5) -> Callable:
+    """
+    Cache the JSON-serializable result of a function in Redis.
+
+    Falls back to calling the function directly if Redis is unavailable.
+
+    Args:
+        key: Redis key to store the result under
+        ttl: Time to live in seconds
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            client = get_redis()
+            if client is not None:
+                try:
+                    hit = client.get(key)
+                    if hit is not None:
+                        return json.loads(hit)
+                except redis.RedisError as e:
+                    _mark_unavailable(e)
+                    client = None
+
+            result = func(*args, **kwargs)
+
+            if client is not None:
+                try:
+                    client.setex(key, ttl, json.dumps(result, default=str))
+                except redis.RedisError as e:
+                    _mark_unavailable(e)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*keys: str) -> None:
+    """
+    Remove cached entries.
+
+    Args:
+        keys: Redis keys to delete
+    """
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(*keys)
+    except redis.RedisError as e:
+        _mark_unavailable(e)
+
+
+def get_many(keys: List[str]) -> Dict[str, Any]:
+    """
+    Fetch several cached JSON values in one round trip.
+
+    Args:
+        keys: Redis keys to read
+
+    Returns:
+        Decoded values of the keys that were cached
+    """
+    client = get_redis()
+    if client is None or not keys:
+        return {}
+    try:
+        values = client.mget(keys)
+    except redis.RedisError as e:
+        _mark_unavailable(e)
+        return {}
+    return {key: json.loads(value) for key, value in zip(keys, values) if value is not None}
+
+
+def set_many(values: Dict[str, Any], ttl: int = 5) -> None:
+    """
+    Cache several JSON-serializable values in one round trip.
+
+    Args:
+        values: Values keyed by Redis key
+        ttl: Time to live in seconds
+    """
+    client = get_redis()
+    if client is None or not values:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipe.setex(key, ttl, json.dumps(value, default=str))
+        pipe.execute()
+    except redis.RedisError as e:
+        _mark_unavailable(e)
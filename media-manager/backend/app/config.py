@@ -1,5 +1,7 @@
 """Application configuration management."""
 
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from pathlib import Path
 from typing import Optional
@@ -155,7 +157,12 @@ class Settings(BaseSettings):
         return self.config_path / "logs"
 
     def ensure_directories(self) -> None:
-        """Ensure all required directories exist."""
+        """
+        Ensure all required directories exist.
+
+        Directories are created in parallel so slow mounts (e.g. spun-down
+        array disks) are waited on concurrently rather than one by one.
+        """
         directories = [
             self.downloads_incomplete_path,
             self.downloads_complete_path,
@@ -168,8 +175,44 @@ class Settings(BaseSettings):
             self.presets_path,
             self.logs_path,
         ]
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=len(directories)) as executor:
+            list(executor.map(lambda d: d.mkdir(parents=True, exist_ok=True), directories))
+
+
+# Computed properties precomputed as plain fields on FrozenSettings
+_DERIVED_FIELDS = (
+    "cors_origins_list",
+    "downloads_incomplete_path",
+    "downloads_complete_path",
+    "downloads_extracted_path",
+    "downloads_quarantine_path",
+    "movies_path",
+    "tv_path",
+    "tmdb_cache_path",
+    "thumbnails_cache_path",
+    "presets_path",
+    "logs_path",
+)
+
+
+class FrozenSettings(namedtuple("FrozenSettings", [*Settings.model_fields, *_DERIVED_FIELDS])):
+    """
+    Immutable snapshot of Settings.
+
+    Settings never change after startup, so the hot paths read them from a
+    plain tuple instead of going through pydantic attribute access and
+    recomputing derived paths on every call.
+    """
+
+    __slots__ = ()
+
+    ensure_directories = Settings.ensure_directories
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "FrozenSettings":
+        """Build a snapshot from a Settings instance."""
+        values = {name: getattr(settings, name) for name in cls._fields}
+        return cls(**values)
 
 
 @lru_cache()
@@ -184,4 +227,4 @@ def get_settings() -> Settings:
 
 
 # Convenience export
-settings = get_settings()
+settings = FrozenSettings.from_settings(get_settings())
@@ -1,11 +1,14 @@
 """Database configuration and session management."""
 
 import logging
-from typing import AsyncGenerator
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Iterator, Optional
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.config import settings
@@ -15,76 +18,189 @@ logger = logging.getLogger(__name__)
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
-    pass
+
+    # Fetch server-generated defaults (created_at, ...) via RETURNING on flush
+    __mapper_args__ = {"eager_defaults": True}
 
 
 # Determine if using SQLite
 is_sqlite = settings.database_url.startswith("sqlite")
+is_memory_db = is_sqlite and (
+    ":memory:" in settings.database_url or settings.database_url.rstrip("/") == "sqlite:"
+)
+
+
+def _async_database_url(url: str) -> str:
+    """Map a synchronous database URL to its asyncio driver."""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def set_sqlite_pragma(dbapi_conn, connection_record):
+    """Enable WAL mode and tune SQLite for better concurrency."""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+    cursor.execute("PRAGMA busy_timeout=5000")  # Wait for locks instead of SQLITE_BUSY
+    cursor.execute("PRAGMA wal_autocheckpoint=1000")
+    cursor.close()
+
+
+def optimize_sqlite(dbapi_conn, connection_record):
+    """Let SQLite refresh planner statistics before a connection closes."""
+    cursor = dbapi_conn.cursor()
+    try:
+        cursor.execute("PRAGMA optimize")
+    finally:
+        cursor.close()
+
 
 # Create engine based on database type
 if is_sqlite:
-    # SQLite: Use synchronous engine with proper configuration
+    # SQLite: Routes run in FastAPI's threadpool, so file-backed databases get
+    # a regular connection pool (one connection per worker thread). Only
+    # in-memory databases share a single connection via StaticPool.
     DATABASE_URL = settings.database_url.replace("sqlite:///", "sqlite+pysqlite:///")
 
+    engine_options = {"poolclass": StaticPool} if is_memory_db else {}
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
         echo=settings.debug,
+        insertmanyvalues_page_size=5000,
+        **engine_options,
     )
-
-    # Enable WAL mode for better concurrency
-    @event.listens_for(engine, "connect")
-    def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        cursor.execute("PRAGMA journal_mode=WAL")
-        cursor.execute("PRAGMA synchronous=NORMAL")
-        cursor.execute("PRAGMA cache_size=-64000")  # 64MB cache
-        cursor.execute("PRAGMA temp_store=MEMORY")
-        cursor.close()
-
-    # Session factory
-    SessionLocal = sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        bind=engine,
-    )
+    event.listen(engine, "connect", set_sqlite_pragma)
+    event.listen(engine, "close", optimize_sqlite)
 
 else:
-    # PostgreSQL or other databases: Use async engine
-    engine = create_async_engine(
+    # PostgreSQL or other databases
+    engine = create_engine(
         settings.database_url,
         echo=settings.debug,
+        pool_size=20,
+        max_overflow=40,
         pool_pre_ping=True,
+        pool_recycle=3600,
+        insertmanyvalues_page_size=5000,
     )
 
-    # Async session factory
-    SessionLocal = async_sessionmaker(
-        engine,
-        class_=AsyncSession,
+# Scope key of the current request, set by request_session_scope()
+_request_scope: ContextVar[Optional[object]] = ContextVar("request_scope", default=None)
+
+
+def _session_scopefunc() -> object:
+    """Scope sessions per request, falling back to the current thread."""
+    scope = _request_scope.get()
+    return scope if scope is not None else threading.get_ident()
+
+
+# Session registry: one session per request (or per thread outside requests)
+SessionLocal = scoped_session(
+    sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
         expire_on_commit=False,
-    )
+    ),
+    scopefunc=_session_scopefunc,
+)
+
+# Async engine for code running directly on the event loop
+async_engine = create_async_engine(
+    _async_database_url(settings.database_url),
+    echo=settings.debug,
+    **({"poolclass": StaticPool} if is_memory_db else {"pool_pre_ping": True}),
+)
+if is_sqlite:
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
+
+# Async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
 
 
 def init_db() -> None:
     """
     Initialize database and create all tables.
 
-    This should be called on application startup.
+    Run out-of-band (entrypoint, tests) before the application starts;
+    the app itself only verifies connectivity via ``check_db_ready``.
     """
     try:
         logger.info("Initializing database...")
+        # Register all tables on Base.metadata (nothing else may have imported them)
+        import app.models  # noqa: F401
+
         Base.metadata.create_all(bind=engine)
+
+        # Upgrade tables created by older versions; status columns store enum
+        # codes, so also convert labels those versions wrote
+        from app.models.migrations import upgrade_schema
+        from app.models.types import convert_enum_labels
+
+        with engine.begin() as conn:
+            upgrade_schema(conn)
+            convert_enum_labels(conn)
+
+        if is_sqlite:
+            # Gather statistics so the planner picks the status/created_at indexes
+            with engine.connect() as conn:
+                conn.execute(text("ANALYZE"))
+                conn.execute(text("PRAGMA optimize"))
         logger.info("Database initialized successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+        logger.error("Failed to initialize database: %s", e)
         raise
 
 
-def get_db() -> Session:
+def check_db_ready() -> None:
+    """
+    Verify the database is reachable.
+
+    Opens a short connection (which applies the connection PRAGMAs) and
+    runs ``SELECT 1``. Raises if the database cannot be used.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+@contextmanager
+def request_session_scope() -> Iterator[None]:
+    """
+    Bind a database session scope to the current request.
+
+    All ``SessionLocal()`` calls inside the scope (including those made from
+    threadpool workers serving the request) return the same session, which
+    is closed and discarded when the scope exits.
+    """
+    token = _request_scope.set(object())
+    try:
+        yield
+    finally:
+        SessionLocal.remove()
+        _request_scope.reset(token)
+
+
+def get_db() -> Iterator[Session]:
     """
     Get database session dependency for FastAPI.
 
+    The session belongs to the current request scope and is removed by the
+    request middleware once the response has been produced.
+
+    Routes using this dependency must be declared with ``def`` so FastAPI
+    runs them in its threadpool instead of blocking the event loop.
+
     Yields:
         Session: Database session
 
@@ -95,11 +211,7 @@ def get_db() -> Session:
             return db.query(Item).all()
         ```
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    yield SessionLocal()
 
 
 async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
@@ -117,7 +229,7 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
             return result.scalars().all()
         ```
     """
-    async with SessionLocal() as session:
+    async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
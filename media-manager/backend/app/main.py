@@ -1,24 +1,40 @@
 """Main FastAPI application."""
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.config import settings
-from app.database import init_db
+from app.database import check_db_ready, request_session_scope
+from app.services.aria2_service import close_aria2_service
+from app.services.progress_buffer import run_progress_flusher
 
 # Configure logging
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
+# SQL statement logging renders every bound parameter; only enable it in debug
+if not settings.debug:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
+# Health payload never changes at runtime, so serialize it once
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "app_name": settings.app_name,
+    "version": "1.0.0-alpha",
+    "environment": settings.app_env,
+})
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -28,31 +44,38 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Handles startup and shutdown events.
     """
     # Startup
-    logger.info(f"Starting {settings.app_name}...")
-    logger.info(f"Environment: {settings.app_env}")
-    logger.info(f"Debug mode: {settings.debug}")
+    logger.info("Starting %s...", settings.app_name)
+    logger.info("Environment: %s", settings.app_env)
+    logger.info("Debug mode: %s", settings.debug)
 
     # Ensure directories exist
     try:
         settings.ensure_directories()
         logger.info("Directories verified")
     except Exception as e:
-        logger.error(f"Failed to create directories: {e}")
+        logger.error("Failed to create directories: %s", e)
 
-    # Initialize database
+    # Schema is created by the entrypoint; only check the database is reachable
     try:
-        init_db()
-        logger.info("Database initialized")
+        check_db_ready()
+        logger.info("Database ready")
     except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+        logger.error("Database not ready: %s", e)
         raise
 
-    logger.info(f"{settings.app_name} started successfully")
+    # Periodically persist buffered download progress
+    flusher = asyncio.create_task(run_progress_flusher())
+
+    logger.info("%s started successfully", settings.app_name)
 
     yield
 
     # Shutdown
-    logger.info(f"Shutting down {settings.app_name}...")
+    logger.info("Shutting down %s...", settings.app_name)
+    flusher.cancel()
+    with suppress(asyncio.CancelledError):
+        await flusher
+    close_aria2_service()
 
 
 # Create FastAPI app
@@ -61,6 +84,7 @@ app = FastAPI(
     description="Automated download, extraction, encoding, and media management for Unraid",
     version="1.0.0-alpha",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/api/docs" if settings.debug else None,
     redoc_url="/api/redoc" if settings.debug else None,
 )
@@ -73,14 +97,23 @@ if settings.enable_cors:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
 
+# Database session per request
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """Provide a request-scoped database session and release it afterwards."""
+    with request_session_scope():
+        return await call_next(request)
+
+
 # Exception handlers
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={
@@ -97,14 +130,9 @@ async def health_check():
     Health check endpoint for monitoring.
 
     Returns:
-        dict: Health status
+        Response: Pre-serialized health status
     """
-    return {
-        "status": "healthy",
-        "app_name": settings.app_name,
-        "version": "1.0.0-alpha",
-        "environment": settings.app_env,
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 # Root endpoint
@@ -133,7 +161,7 @@ try:
         app.mount("/", StaticFiles(directory=str(frontend_dist), html=True), name="static")
         logger.info("Frontend static files mounted")
 except Exception as e:
-    logger.warning(f"Could not mount frontend static files: {e}")
+    logger.warning("Could not mount frontend static files: %s", e)
 
 
 # Import and include routers
@@ -5,6 +5,7 @@ from app.models.base import (
     DownloadStatus,
     EncodingStatus,
     ExtractionStatus,
+    HwAccel,
     MediaType,
     MetadataStatus,
     TaskStatus,
@@ -15,8 +16,9 @@ from app.models.base import (
 from app.models.container import Container
 from app.models.download import Download
 from app.models.encoding import EncodingJob, EncodingPreset
-from app.models.metadata import MediaMetadata
+from app.models.metadata import MediaMetadata, MediaSearchResult
 from app.models.password import ArchivePassword
+from app.models.path import FilePath
 from app.models.worker import Worker
 
 __all__ = [
@@ -25,7 +27,9 @@ __all__ = [
     "Download",
     "EncodingJob",
     "EncodingPreset",
+    "FilePath",
     "MediaMetadata",
+    "MediaSearchResult",
     "PremiumAccount",
     "ArchivePassword",
     "Worker",
@@ -33,6 +37,7 @@ __all__ = [
     "DownloadStatus",
     "EncodingStatus",
     "ExtractionStatus",
+    "HwAccel",
     "MediaType",
     "MetadataStatus",
     "TaskStatus",
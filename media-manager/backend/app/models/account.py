@@ -1,6 +1,10 @@
 """Premium account database model."""
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
 from app.models.base import TimestampMixin
@@ -11,34 +15,34 @@ class PremiumAccount(Base, TimestampMixin):
 
     __tablename__ = "premium_accounts"
 
-    id = Column(Integer, primary_key=True, index=True)
-    provider = Column(String(50), nullable=False, index=True)  # rapidgator, ddownload, etc.
-    name = Column(String(100))  # User-friendly name
-    username = Column(String(255), nullable=False)
-    password_encrypted = Column(Text, nullable=False)  # Encrypted password
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    provider: Mapped[str] = mapped_column(String(50), index=True)  # rapidgator, ddownload, etc.
+    name: Mapped[Optional[str]] = mapped_column(String(100))  # User-friendly name
+    username: Mapped[str] = mapped_column(String(255))
+    password_encrypted: Mapped[str] = mapped_column(Text)  # Encrypted password
 
     # Status
-    is_active = Column(Boolean, default=True)
-    is_valid = Column(Boolean, default=True)  # Set to False if login fails
-    last_validated = Column(DateTime(timezone=True))
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    is_valid: Mapped[Optional[bool]] = mapped_column(default=True)  # Set to False if login fails
+    last_validated: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     # Usage tracking
-    last_used = Column(DateTime(timezone=True))
-    use_count = Column(Integer, default=0)
+    last_used: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    use_count: Mapped[Optional[int]] = mapped_column(default=0)
 
     # Account limits (if applicable)
-    daily_limit = Column(Integer)  # Daily download limit in bytes
-    daily_used = Column(Integer, default=0)
-    limit_reset_at = Column(DateTime(timezone=True))
+    daily_limit: Mapped[Optional[int]]  # Daily download limit in bytes
+    daily_used: Mapped[Optional[int]] = mapped_column(default=0)
+    limit_reset_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     # Premium status
-    premium_until = Column(DateTime(timezone=True))
-    traffic_left = Column(Integer)  # Remaining traffic in bytes
+    premium_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    traffic_left: Mapped[Optional[int]]  # Remaining traffic in bytes
 
     # Additional data
-    api_key = Column(Text)  # Some providers use API keys
-    cookies = Column(Text)  # Stored session cookies (encrypted)
-    extra_data = Column(Text)  # JSON for provider-specific data
+    api_key: Mapped[Optional[str]] = mapped_column(Text)  # Some providers use API keys
+    cookies: Mapped[Optional[str]] = mapped_column(Text)  # Stored session cookies (encrypted)
+    extra_data: Mapped[Optional[str]] = mapped_column(Text)  # JSON for provider-specific data
 
     def __repr__(self):
         return f"<PremiumAccount(id={self.id}, provider={self.provider}, username={self.username})>"
@@ -1,19 +1,42 @@
 """Base models and enums for database."""
 
 from datetime import datetime
-from enum import Enum as PyEnum
+from enum import Enum as PyEnum, IntFlag
 
 from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.orm import declared_attr
 from sqlalchemy.sql import func
 
 from app.database import Base
 
 
+# Shared by all timestamp columns instead of building one per model
+_NOW = func.now()
+
+
 class TimestampMixin:
-    """Mixin for adding timestamp columns."""
+    """
+    Mixin for adding timestamp columns.
+
+    Models that query by creation time alone can set
+    ``__created_at_index__ = True``; the others already cover ``created_at``
+    through their composite or partial indexes.
+    """
+
+    __created_at_index__ = False
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    @declared_attr
+    def created_at(cls):
+        return Column(
+            DateTime(timezone=True),
+            server_default=_NOW,
+            nullable=False,
+            index=cls.__created_at_index__,
+        )
+
+    @declared_attr
+    def updated_at(cls):
+        return Column(DateTime(timezone=True), onupdate=_NOW)
 
 
 class TaskStatus(str, PyEnum):
@@ -88,6 +111,16 @@ class WorkerType(str, PyEnum):
     REMOTE = "remote"
 
 
+class HwAccel(IntFlag):
+    """Hardware encoders a worker can use (bitmask)."""
+
+    NONE = 0
+    NVENC = 1
+    QSV = 2
+    AMF = 4
+    VAAPI = 8
+
+
 class WorkerStatus(str, PyEnum):
     """Worker status."""
 
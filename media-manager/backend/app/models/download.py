@@ -1,37 +1,45 @@
 """Download database model."""
 
-from sqlalchemy import Column, Float, Integer, String, Text, ForeignKey
+from sqlalchemy import BigInteger, Column, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.sqlite import JSON
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 from app.models.base import DownloadStatus, TimestampMixin
+from app.models.path import FilePath, interned_path
+from app.models.types import EnumInt
 
 
 class Download(Base, TimestampMixin):
     """Download model."""
 
     __tablename__ = "downloads"
+    __table_args__ = (
+        # Status filter + newest-first keyset pagination
+        Index("ix_downloads_status_id", "status", "id"),
+        # Covers the per-container status aggregates
+        Index("ix_downloads_container_status", "container_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(Text, nullable=False)
     filename = Column(String(500))
-    status = Column(String(20), default=DownloadStatus.PENDING.value, index=True)
+    status = Column(EnumInt(DownloadStatus), default=DownloadStatus.PENDING.value)
 
     # Progress tracking
     progress = Column(Float, default=0.0)  # Percentage 0-100
     speed = Column(Float, default=0.0)  # Bytes per second
-    size_total = Column(Integer)  # Total size in bytes
-    size_downloaded = Column(Integer, default=0)  # Downloaded size in bytes
+    size_total = Column(BigInteger)  # Total size in bytes
+    size_downloaded = Column(BigInteger, default=0)  # Downloaded size in bytes
     eta = Column(Integer)  # Estimated time remaining in seconds
 
     # Download details
     aria2_gid = Column(String(50), unique=True, index=True)  # aria2c download GID
     premium_account_id = Column(Integer, nullable=True)  # FK to premium account
-    container_id = Column(Integer, ForeignKey("containers.id"), nullable=True, index=True)  # FK to container
+    container_id = Column(Integer, ForeignKey("containers.id"), nullable=True)  # FK to container
 
     # File info
-    file_path = Column(Text)  # Path where file is/will be stored
+    file_path_id = Column(Integer, ForeignKey("paths.id"))  # Interned path of the file
     file_hash = Column(String(64))  # SHA-256 hash for verification
 
     # Error handling
@@ -45,6 +53,10 @@ class Download(Base, TimestampMixin):
 
     # Relationships
     container = relationship("Container", back_populates="downloads")
+    file_path_ref = relationship(FilePath, lazy="joined")
+
+    # Path where file is/will be stored
+    file_path = interned_path("file_path_ref", file_path_id)
 
     def __repr__(self):
         return f"<Download(id={self.id}, filename={self.filename}, status={self.status})>"
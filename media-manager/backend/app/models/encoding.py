@@ -1,10 +1,13 @@
 """Encoding database models."""
 
-from sqlalchemy import Boolean, Column, Float, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Column, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.sqlite import JSON
+from sqlalchemy.orm import relationship
 
 from app.database import Base
 from app.models.base import EncodingStatus, TimestampMixin, WorkerType
+from app.models.path import FilePath, interned_path
+from app.models.types import EnumInt
 
 
 class EncodingPreset(Base, TimestampMixin):
@@ -61,19 +64,27 @@ class EncodingJob(Base, TimestampMixin):
     """Encoding job model."""
 
     __tablename__ = "encoding_jobs"
+    __table_args__ = (
+        # Status filter + oldest-first queue order
+        Index("ix_encoding_jobs_status_created", "status", "created_at"),
+        # Worker dispatch: jobs of a worker by status
+        Index("ix_encoding_jobs_worker_status", "worker_id", "status"),
+        # Per-download job lookup
+        Index("ix_encoding_jobs_download_id_status", "download_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    download_id = Column(Integer, index=True)  # FK to download
+    download_id = Column(Integer)  # FK to download
     preset_id = Column(Integer, index=True)  # FK to preset
 
     # File info
-    input_file = Column(Text, nullable=False)
-    output_file = Column(Text, nullable=False)
-    input_size = Column(Integer)  # Bytes
-    output_size = Column(Integer)  # Bytes
+    input_file_id = Column(Integer, ForeignKey("paths.id"), nullable=False)  # Interned paths
+    output_file_id = Column(Integer, ForeignKey("paths.id"), nullable=False)
+    input_size = Column(BigInteger)  # Bytes
+    output_size = Column(BigInteger)  # Bytes
 
     # Status
-    status = Column(String(20), default=EncodingStatus.PENDING.value, index=True)
+    status = Column(EnumInt(EncodingStatus), default=EncodingStatus.PENDING.value)
     progress = Column(Float, default=0.0)  # Percentage 0-100
     fps = Column(Float)  # Current encoding FPS
     eta = Column(Integer)  # Estimated time remaining in seconds
@@ -95,5 +106,12 @@ class EncodingJob(Base, TimestampMixin):
     # FFmpeg command for reference/debugging
     ffmpeg_command = Column(Text)
 
+    # Relationships
+    input_file_ref = relationship(FilePath, foreign_keys=[input_file_id], lazy="joined")
+    output_file_ref = relationship(FilePath, foreign_keys=[output_file_id], lazy="joined")
+
+    input_file = interned_path("input_file_ref", input_file_id)
+    output_file = interned_path("output_file_ref", output_file_id)
+
     def __repr__(self):
         return f"<EncodingJob(id={self.id}, status={self.status}, progress={self.progress}%)>"
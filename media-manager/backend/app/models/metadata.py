@@ -1,22 +1,42 @@
 """TMDB metadata database model."""
 
-from sqlalchemy import Column, Float, Integer, String, Text
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.sqlite import JSON
+from sqlalchemy.orm import relationship
 
 from app.database import Base
 from app.models.base import MediaType, MetadataStatus, TimestampMixin
+from app.models.path import FilePath, interned_path
+from app.models.types import EnumInt
+
+_STATUS_TYPE = EnumInt(MetadataStatus)
+_UNRESOLVED = _STATUS_TYPE.sql_in(
+    "status",
+    MetadataStatus.PENDING,
+    MetadataStatus.SEARCHING,
+    MetadataStatus.MANUAL_REQUIRED,
+)
 
 
 class MediaMetadata(Base, TimestampMixin):
     """TMDB metadata model."""
 
     __tablename__ = "media_metadata"
+    __table_args__ = (
+        # Only unresolved entries are polled; resolved rows stay out of the index
+        Index(
+            "ix_metadata_pending",
+            "created_at",
+            sqlite_where=text(_UNRESOLVED),
+            postgresql_where=text(_UNRESOLVED),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     download_id = Column(Integer, index=True)  # FK to download
 
     # File info
-    file_path = Column(Text, nullable=False)
+    file_path_id = Column(Integer, ForeignKey("paths.id"), nullable=False)  # Interned path
     original_filename = Column(String(500))
 
     # Detected info (from filename)
@@ -56,12 +76,19 @@ class MediaMetadata(Base, TimestampMixin):
     fanart_path = Column(Text)  # Local path after download
 
     # Status
-    status = Column(String(20), default=MetadataStatus.PENDING.value, index=True)
+    status = Column(_STATUS_TYPE, default=MetadataStatus.PENDING.value)
     confidence = Column(Float, default=0.0)  # Match confidence 0-1
     manual_selection = Column(Integer)  # Set if user manually selected from results
 
-    # Multiple results for manual selection
-    search_results = Column(JSON)  # List of potential matches
+    # Multiple results for manual selection (only loaded by the selection dialog)
+    search_results = relationship(
+        "MediaSearchResult",
+        back_populates="media_metadata",
+        cascade="all, delete-orphan",
+        order_by="MediaSearchResult.rank",
+    )
+    file_path_ref = relationship(FilePath, lazy="joined")
+    file_path = interned_path("file_path_ref", file_path_id)
 
     # Generated NFO path
     nfo_path = Column(Text)
@@ -71,3 +98,26 @@ class MediaMetadata(Base, TimestampMixin):
 
     def __repr__(self):
         return f"<MediaMetadata(id={self.id}, title={self.title}, status={self.status})>"
+
+
+class MediaSearchResult(Base):
+    """TMDB candidate offered for manual selection of a metadata entry."""
+
+    __tablename__ = "metadata_search_results"
+
+    metadata_id = Column(
+        Integer, ForeignKey("media_metadata.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank = Column(Integer, primary_key=True)  # Position in the TMDB result list
+    tmdb_id = Column(Integer, nullable=False)
+    title = Column(String(500))
+    year = Column(Integer)
+    poster_path = Column(Text)
+
+    media_metadata = relationship("MediaMetadata", back_populates="search_results")
+
+    def __repr__(self):
+        return (
+            f"<MediaSearchResult(metadata_id={self.metadata_id}, rank={self.rank}, "
+            f"title={self.title})>"
+        )
@@ -0,0 +1,277 @@
+"""In-place upgrades for databases created by older versions.
+
+The tree has no Alembic environment. ``create_all`` only creates missing
+tables, so ``init_db`` runs these idempotent steps afterwards to bring
+existing tables up to the current models.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    MetaData,
+    Table,
+    case,
+    column,
+    func,
+    insert,
+    inspect,
+    select,
+    table,
+    update,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn, CreateTable, DropTable
+from sqlalchemy.sql.expression import ColumnElement, TableClause
+
+from app.database import Base
+from app.models.base import HwAccel
+from app.models.download import Download
+from app.models.encoding import EncodingJob
+from app.models.metadata import MediaMetadata, MediaSearchResult
+from app.models.path import FilePath
+from app.models.worker import Worker
+
+logger = logging.getLogger(__name__)
+
+_RE_YEAR = re.compile(r"^(\d{4})")
+
+# Path ID columns and the legacy path string columns they replace
+_INTERNED_PATHS = {
+    Download.__table__: {"file_path_id": "file_path"},
+    EncodingJob.__table__: {"input_file_id": "input_file", "output_file_id": "output_file"},
+    MediaMetadata.__table__: {"file_path_id": "file_path"},
+}
+
+
+def upgrade_schema(conn: Connection) -> None:
+    """
+    Apply all pending schema upgrades.
+
+    Args:
+        conn: Open connection (the caller commits)
+    """
+    _add_worker_capabilities(conn)
+    _add_worker_success_rate(conn)
+    _move_metadata_search_results(conn)
+    _intern_paths(conn)
+    _sync_indexes(conn)
+
+
+def _column_names(conn: Connection, table_name: str) -> Set[str]:
+    """Columns the table currently has in the database."""
+    return {info["name"] for info in inspect(conn).get_columns(table_name)}
+
+
+def _quote(conn: Connection, name: str) -> str:
+    """Quote an identifier for the connection's dialect."""
+    return conn.dialect.identifier_preparer.quote(name)
+
+
+def _add_column(conn: Connection, column: Column) -> None:
+    """Add a model column to its existing table."""
+    logger.info("Adding column %s.%s", column.table.name, column.name)
+    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+    conn.exec_driver_sql(f"ALTER TABLE {_quote(conn, column.table.name)} ADD COLUMN {ddl}")
+
+
+def _drop_column(conn: Connection, table_name: str, column_name: str) -> None:
+    """Drop a column the models no longer declare."""
+    logger.info("Dropping column %s.%s", table_name, column_name)
+    conn.exec_driver_sql(
+        f"ALTER TABLE {_quote(conn, table_name)} DROP COLUMN {_quote(conn, column_name)}"
+    )
+
+
+def _rebuild_table(
+    conn: Connection,
+    model_table: Table,
+    derive: Optional[Callable[[TableClause], Dict[str, ColumnElement]]] = None,
+) -> None:
+    """
+    Recreate a table from its model definition, keeping the rows.
+
+    SQLite cannot add stored generated columns or NOT NULL columns without a
+    default with ALTER TABLE. Columns shared with the old table are copied;
+    ``derive`` maps new columns to expressions over the old table's columns.
+    Indexes are left to ``_sync_indexes``.
+    """
+    logger.info("Rebuilding table %s", model_table.name)
+    existing = _column_names(conn, model_table.name)
+    old = table(model_table.name, *(column(name) for name in existing))
+    derived = derive(old) if derive else {}
+    # The staging copy renders foreign keys, so it needs the tables they refer to
+    staging_metadata = MetaData()
+    for referred in {fk.column.table for fk in model_table.foreign_keys}:
+        referred.to_metadata(staging_metadata)
+    staging = model_table.to_metadata(staging_metadata, name=f"_{model_table.name}_new")
+    shared = [
+        col.name
+        for col in model_table.columns
+        if col.name in existing and col.computed is None and col.name not in derived
+    ]
+
+    conn.execute(CreateTable(staging))
+    conn.execute(
+        insert(staging).from_select(
+            shared + list(derived),
+            select(*(old.c[name] for name in shared), *derived.values()),
+        )
+    )
+    conn.execute(DropTable(model_table))
+    conn.exec_driver_sql(
+        f"ALTER TABLE {_quote(conn, staging.name)} RENAME TO {_quote(conn, model_table.name)}"
+    )
+
+
+def _add_worker_capabilities(conn: Connection) -> None:
+    """Replace the single ``hardware_accel`` encoder name with the capability bitmask."""
+    columns = _column_names(conn, Worker.__tablename__)
+    if "capabilities" not in columns:
+        _add_column(conn, Worker.__table__.c.capabilities)
+    if "hardware_accel" not in columns:
+        return
+
+    legacy = table(Worker.__tablename__, column("hardware_accel"), column("capabilities"))
+    names = {member.name.lower(): member.value for member in HwAccel if member}
+    conn.execute(
+        update(legacy).values(
+            capabilities=case(names, value=func.lower(legacy.c.hardware_accel), else_=0)
+        )
+    )
+    _drop_column(conn, Worker.__tablename__, "hardware_accel")
+
+
+def _add_worker_success_rate(conn: Connection) -> None:
+    """Add the generated ``success_rate`` column."""
+    if "success_rate" in _column_names(conn, Worker.__tablename__):
+        return
+    if conn.dialect.name == "sqlite":
+        _rebuild_table(conn, Worker.__table__)
+    else:
+        _add_column(conn, Worker.__table__.c.success_rate)
+
+
+def _search_result_row(metadata_id: int, rank: int, item: Any) -> Optional[Dict[str, Any]]:
+    """Map one stored TMDB candidate to a ``metadata_search_results`` row."""
+    if not isinstance(item, dict):
+        return None
+    tmdb_id = item.get("tmdb_id") or item.get("id")
+    if tmdb_id is None:
+        return None
+
+    year = item.get("year")
+    if year is None:
+        match = _RE_YEAR.match(str(item.get("release_date") or item.get("first_air_date") or ""))
+        year = int(match.group(1)) if match else None
+
+    return {
+        "metadata_id": metadata_id,
+        "rank": rank,
+        "tmdb_id": int(tmdb_id),
+        "title": item.get("title") or item.get("name"),
+        "year": year,
+        "poster_path": item.get("poster_path"),
+    }
+
+
+def _move_metadata_search_results(conn: Connection) -> None:
+    """Copy the legacy ``search_results`` JSON lists into their child table."""
+    if "search_results" not in _column_names(conn, MediaMetadata.__tablename__):
+        return
+
+    legacy = table(MediaMetadata.__tablename__, column("id"), column("search_results", JSON))
+    rows: List[Dict[str, Any]] = []
+    for metadata_id, results in conn.execute(
+        select(legacy.c.id, legacy.c.search_results).where(legacy.c.search_results.isnot(None))
+    ):
+        for rank, item in enumerate(results if isinstance(results, list) else []):
+            row = _search_result_row(metadata_id, rank, item)
+            if row is not None:
+                rows.append(row)
+
+    if rows:
+        logger.info("Moving %d metadata search results", len(rows))
+        conn.execute(insert(MediaSearchResult.__table__), rows)
+    _drop_column(conn, MediaMetadata.__tablename__, "search_results")
+
+
+def _path_id(paths: Table, value: ColumnElement) -> ColumnElement:
+    """ID of the interned path with the given value."""
+    return select(paths.c.id).where(paths.c.value == value).scalar_subquery()
+
+
+def _intern_paths(conn: Connection) -> None:
+    """Move legacy path string columns into ``paths`` and point the rows at it by ID."""
+    paths = FilePath.__table__
+    for model_table, moves in _INTERNED_PATHS.items():
+        columns = _column_names(conn, model_table.name)
+        moves = {new: name for new, name in moves.items() if name in columns}
+        if not moves:
+            continue
+
+        legacy = table(model_table.name, *(column(name) for name in {*moves, *moves.values()}))
+        for name in moves.values():
+            logger.info("Interning paths of %s.%s", model_table.name, name)
+            conn.execute(
+                insert(paths).from_select(
+                    ["value"],
+                    select(legacy.c[name])
+                    .where(legacy.c[name].isnot(None), legacy.c[name].not_in(select(paths.c.value)))
+                    .distinct(),
+                )
+            )
+
+        if conn.dialect.name == "sqlite":
+            # The ID columns may be NOT NULL, which SQLite cannot add to existing rows
+            _rebuild_table(
+                conn,
+                model_table,
+                lambda old: {new: _path_id(paths, old.c[name]) for new, name in moves.items()},
+            )
+            continue
+
+        for new, name in moves.items():
+            logger.info("Adding column %s.%s", model_table.name, new)
+            conn.exec_driver_sql(
+                f"ALTER TABLE {_quote(conn, model_table.name)} "
+                f"ADD COLUMN {_quote(conn, new)} INTEGER REFERENCES {_quote(conn, paths.name)} (id)"
+            )
+            conn.execute(update(legacy).values({new: _path_id(paths, legacy.c[name])}))
+            if not model_table.c[new].nullable:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {_quote(conn, model_table.name)} "
+                    f"ALTER COLUMN {_quote(conn, new)} SET NOT NULL"
+                )
+            _drop_column(conn, model_table.name, name)
+
+
+def _sync_indexes(conn: Connection) -> None:
+    """Create model indexes missing from existing tables and drop retired ones."""
+    inspector = inspect(conn)
+    for model_table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(model_table.name)}
+        columns = _column_names(conn, model_table.name)
+        declared = {index.name for index in model_table.indexes}
+
+        for index in model_table.indexes:
+            if index.name in existing:
+                continue
+            missing = {col.name for col in index.columns} - columns
+            if missing:
+                logger.warning(
+                    "Skipping index %s: %s lacks columns %s",
+                    index.name, model_table.name, ", ".join(sorted(missing)),
+                )
+                continue
+            logger.info("Creating index %s", index.name)
+            index.create(conn, checkfirst=True)
+
+        # Single-column indexes replaced by composites in the models
+        for name in existing - declared:
+            if name and name.startswith(f"ix_{model_table.name}_"):
+                logger.info("Dropping retired index %s", name)
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {_quote(conn, name)}")
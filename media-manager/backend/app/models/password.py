@@ -1,6 +1,6 @@
 """Archive password database model."""
 
-from sqlalchemy import Boolean, Column, Integer, String
+from sqlalchemy import Boolean, Column, Index, Integer, String, text
 
 from app.database import Base
 from app.models.base import TimestampMixin
@@ -10,6 +10,17 @@ class ArchivePassword(Base, TimestampMixin):
     """Archive password model for automatic extraction."""
 
     __tablename__ = "archive_passwords"
+    __table_args__ = (
+        # Password tryer order for active entries: scanned backwards for
+        # ORDER BY priority DESC, success_count DESC without a sort
+        Index(
+            "ix_passwords_active_prio",
+            "priority",
+            "success_count",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     password = Column(String(255), unique=True, nullable=False, index=True)
@@ -0,0 +1,46 @@
+"""Interned file path database model."""
+
+from typing import Optional
+
+from sqlalchemy import Column, Integer, Text, select
+from sqlalchemy.ext.hybrid import hybrid_property
+
+from app.database import Base
+
+
+class FilePath(Base):
+    """File path stored once and referenced by ID from the rows using it."""
+
+    __tablename__ = "paths"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Text, nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<FilePath(id={self.id}, value={self.value})>"
+
+
+def interned_path(relationship_name: str, path_id: Column) -> hybrid_property:
+    """
+    Read-only path string of a ``paths.id`` foreign key.
+
+    On instances the value comes from the (eagerly joined) ``FilePath``
+    relationship; in queries it is a scalar subquery on ``path_id``. Writes
+    go to the ID column (see ``PathService.intern``).
+
+    Args:
+        relationship_name: Many-to-one relationship to ``FilePath``
+        path_id: Foreign key column of the owning model
+
+    Returns:
+        Hybrid property with the path string
+    """
+
+    def value(self) -> Optional[str]:
+        path = getattr(self, relationship_name)
+        return path.value if path is not None else None
+
+    def expression(cls):
+        return select(FilePath.value).where(FilePath.id == path_id).scalar_subquery()
+
+    return hybrid_property(value, expr=expression)
@@ -0,0 +1,93 @@
+"""Custom column types."""
+
+import logging
+from enum import Enum
+from typing import Optional, Type
+
+from sqlalchemy import SmallInteger, Text, case, type_coerce
+from sqlalchemy.engine import Connection
+from sqlalchemy.types import TypeDecorator
+
+from app.database import Base
+
+logger = logging.getLogger(__name__)
+
+
+class EnumInt(TypeDecorator):
+    """
+    Store a string enum as a small integer code.
+
+    Codes are the member positions in the enum definition, so new members
+    must only ever be appended. Values are bound and returned as the enum's
+    string value, keeping the ORM/API side unchanged.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls: Type[Enum], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_cls = enum_cls
+        self._members = list(enum_cls)
+        self._codes = {member.value: code for code, member in enumerate(self._members)}
+        self._unknown = set()  # Unreadable stored values already logged
+
+    def code(self, value: str) -> int:
+        """Integer code stored for an enum value."""
+        # str-enum members hash and compare like their values, so one dict
+        # lookup serves both without constructing the enum per row
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {self.enum_cls.__name__}") from None
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return self.code(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        # Legacy TEXT-affinity columns hand codes back as strings
+        try:
+            code = int(value)
+        except (TypeError, ValueError):
+            code = None
+        if code is not None and 0 <= code < len(self._members):
+            return self._members[code].value
+        if value in self._codes:
+            return value  # Label not yet converted by convert_enum_labels
+
+        # Keep the row readable; the raw value is passed through as a string
+        if value not in self._unknown:
+            self._unknown.add(value)
+            logger.warning("Unknown %s value %r in database", self.enum_cls.__name__, value)
+        return str(value)
+
+    def sql_in(self, column: str, *values: Enum) -> str:
+        """Raw SQL predicate matching the given members (for partial indexes)."""
+        codes = ", ".join(str(self.code(v)) for v in values)
+        return f"{column} IN ({codes})"
+
+
+def convert_enum_labels(conn: Connection) -> None:
+    """
+    Rewrite string enum labels left by older schemas to their integer codes.
+
+    Values that are not labels of the enum are left untouched.
+
+    Args:
+        conn: Open connection (the caller commits)
+    """
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if not isinstance(column.type, EnumInt):
+                continue
+            # Compare and bind the stored labels as text, bypassing EnumInt
+            raw = type_coerce(column, Text)
+            codes = column.type._codes
+            # Self-assign onupdate columns so the rewrite keeps updated_at as is
+            values = {col: col for col in table.columns if col.onupdate is not None}
+            values[column] = case(codes, value=raw)
+            conn.execute(table.update().where(raw.in_(list(codes))).values(values))
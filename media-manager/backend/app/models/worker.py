@@ -1,15 +1,43 @@
 """Remote worker database model."""
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.ext.hybrid import hybrid_method
 
 from app.database import Base
-from app.models.base import TimestampMixin, WorkerStatus, WorkerType
+from app.models.base import HwAccel, TimestampMixin, WorkerStatus, WorkerType
+from app.models.types import EnumInt
+
+_STATUS_TYPE = EnumInt(WorkerStatus)
+_ONLINE = _STATUS_TYPE.sql_in("status", WorkerStatus.ONLINE)
 
 
 class Worker(Base, TimestampMixin):
     """Remote encoding worker model."""
 
     __tablename__ = "workers"
+    __table_args__ = (
+        # Dispatch by status and required encoder capabilities
+        Index("ix_workers_status_capabilities", "status", "capabilities", "priority"),
+        # Dispatch only ever looks at enabled, online workers
+        Index(
+            "ix_workers_online",
+            "priority",
+            "current_jobs",
+            sqlite_where=text(f"{_ONLINE} AND is_enabled = 1"),
+            postgresql_where=text(f"{_ONLINE} AND is_enabled"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -22,12 +50,12 @@ class Worker(Base, TimestampMixin):
     use_https = Column(Boolean, default=False)
 
     # Status
-    status = Column(String(20), default=WorkerStatus.OFFLINE.value, index=True)
+    status = Column(_STATUS_TYPE, default=WorkerStatus.OFFLINE.value)
     last_seen = Column(DateTime(timezone=True))
     last_health_check = Column(DateTime(timezone=True))
 
     # Capabilities
-    hardware_accel = Column(String(20))  # nvenc, qsv, amf, none
+    capabilities = Column(Integer, default=HwAccel.NONE.value)  # HwAccel bitmask
     max_parallel_jobs = Column(Integer, default=1)
     current_jobs = Column(Integer, default=0)
 
@@ -36,6 +64,15 @@ class Worker(Base, TimestampMixin):
     successful_jobs = Column(Integer, default=0)
     failed_jobs = Column(Integer, default=0)
     average_speed = Column(Float)  # Average encoding speed multiplier
+    success_rate = Column(
+        Float,
+        Computed(
+            "CASE WHEN COALESCE(total_jobs, 0) = 0 THEN 0.0 "
+            "ELSE CAST(successful_jobs AS REAL) / total_jobs END",
+            persisted=True,
+        ),
+        index=True,
+    )  # Maintained by the database for ORDER BY success_rate
 
     # Load
     cpu_usage = Column(Float)
@@ -61,9 +98,11 @@ class Worker(Base, TimestampMixin):
         protocol = "https" if self.use_https else "http"
         return f"{protocol}://{self.host}:{self.port}"
 
-    @property
-    def success_rate(self) -> float:
-        """Calculate success rate."""
-        if self.total_jobs == 0:
-            return 0.0
-        return self.successful_jobs / self.total_jobs
+    @hybrid_method
+    def has_capability(self, mask: HwAccel) -> bool:
+        """Whether the worker supports any of the encoders in ``mask``."""
+        return bool((self.capabilities or 0) & mask)
+
+    @has_capability.expression
+    def has_capability(cls, mask: HwAccel):
+        return cls.capabilities.op("&")(int(mask)) != 0
@@ -1,12 +1,11 @@
 """Container schemas for API validation."""
 
 from datetime import datetime
-from typing import Any, List, Optional, TYPE_CHECKING
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-if TYPE_CHECKING:
-    from app.schemas.download import DownloadResponse
+from app.schemas.download import DownloadResponse
 
 
 class ContainerCreate(BaseModel):
@@ -31,6 +30,8 @@ class ContainerCreateManual(BaseModel):
 class ContainerResponse(BaseModel):
     """Schema for container response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     url: Optional[str]
@@ -43,20 +44,15 @@ class ContainerResponse(BaseModel):
     description: Optional[str]
     password: Optional[str]
     created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
+    updated_at: Optional[datetime] = None
 
 
 class ContainerWithDownloads(ContainerResponse):
     """Schema for container with downloads."""
 
-    downloads: List[Any] = []
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        from_attributes = True
-        arbitrary_types_allowed = True
+    downloads: List[DownloadResponse] = []
 
 
 class ContainerStats(BaseModel):
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 class DownloadCreate(BaseModel):
@@ -23,6 +23,8 @@ class DownloadBulkCreate(BaseModel):
 class DownloadResponse(BaseModel):
     """Schema for download response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     url: str
     filename: Optional[str] = None
@@ -40,9 +42,6 @@ class DownloadResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-
 
 class DownloadUpdate(BaseModel):
     """Schema for updating a download."""
@@ -1,14 +1,45 @@
 """aria2c RPC client service."""
 
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import aria2p
+import requests
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Only the tellStatus fields the status sync persists
+_STATUS_KEYS = ["gid", "status", "totalLength", "completedLength", "downloadSpeed", "files"]
+
+# Seconds global stats / download listings are reused between calls
+_POLL_CACHE_TTL = 0.5
+
+# Keep-alive connections kept open to aria2c (one per concurrent request thread)
+_RPC_POOL_SIZE = 20
+
+# Upper bound for tellWaiting/tellStopped listings
+_MAX_LISTED = 1000
+
+
+class _PooledClient(aria2p.Client):
+    """aria2p client that reuses keep-alive connections instead of one per call."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=_RPC_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, payload: str) -> dict:
+        """Send a JSON-RPC request over the pooled session."""
+        return self.session.post(self.server, data=payload, timeout=self.timeout).json()
+
 
 class Aria2Service:
     """Service for interacting with aria2c via RPC."""
@@ -16,6 +47,10 @@ class Aria2Service:
     def __init__(self):
         """Initialize aria2c client."""
         self.client: Optional[aria2p.API] = None
+        # (fetched_at, value) snapshots shared by concurrent pollers
+        self._stats_cache: Optional[Tuple[float, Dict]] = None
+        self._downloads_cache: Optional[Tuple[float, List[aria2p.Download]]] = None
+        self._cache_lock = threading.Lock()
         self._connect()
 
     def _connect(self) -> None:
@@ -23,15 +58,15 @@ class Aria2Service:
         try:
             # Create aria2c client
             self.client = aria2p.API(
-                aria2p.Client(
+                _PooledClient(
                     host=f"http://{settings.aria2c_host}",
                     port=settings.aria2c_port,
                     secret=settings.aria2c_secret if settings.aria2c_secret else "",
                 )
             )
-            logger.info(f"Connected to aria2c at {settings.aria2c_host}:{settings.aria2c_port}")
+            logger.info("Connected to aria2c at %s:%s", settings.aria2c_host, settings.aria2c_port)
         except Exception as e:
-            logger.error(f"Failed to connect to aria2c: {e}")
+            logger.error("Failed to connect to aria2c: %s", e)
             self.client = None
 
     def add_download(
@@ -54,26 +89,71 @@ class Aria2Service:
             return None
 
         try:
-            default_options = {
-                "dir": str(settings.downloads_incomplete_path),
-                "max-connection-per-server": "16",
-                "split": "16",
-                "min-split-size": "1M",
-                "continue": "true",
-            }
+            download = self.client.add_uris([url], options=self._download_options(options))
+            logger.info("Added download: %s (GID: %s)", url, download.gid)
+            return download.gid
+        except Exception as e:
+            logger.error("Failed to add download %s: %s", url, e)
+            return None
+
+    def add_downloads_bulk(
+        self,
+        urls: List[str],
+        options: Optional[Dict] = None,
+    ) -> List[Optional[str]]:
+        """
+        Add several downloads to aria2c in one multicall.
 
-            if settings.max_download_speed > 0:
-                default_options["max-download-limit"] = str(settings.max_download_speed * 1024)
+        Args:
+            urls: Download URLs
+            options: aria2c options dict applied to every download
 
-            if options:
-                default_options.update(options)
+        Returns:
+            list: GID per URL, in order (None where aria2c rejected the URL)
+        """
+        if not self.client:
+            logger.error("aria2c client not connected")
+            return [None] * len(urls)
+        if not urls:
+            return []
 
-            download = self.client.add_uris([url], options=default_options)
-            logger.info(f"Added download: {url} (GID: {download.gid})")
-            return download.gid
+        download_options = self._download_options(options)
+        try:
+            results = self.client.client.multicall2(
+                [(aria2p.Client.ADD_URI, [[url], download_options]) for url in urls]
+            )
         except Exception as e:
-            logger.error(f"Failed to add download {url}: {e}")
-            return None
+            logger.error("Failed to add %d downloads: %s", len(urls), e)
+            return [None] * len(urls)
+
+        gids: List[Optional[str]] = []
+        for url, result in zip(urls, results):
+            # Successful calls are wrapped in a list, failures are fault dicts
+            if isinstance(result, list):
+                gids.append(result[0])
+            else:
+                logger.error("Failed to add download %s: %s", url, result.get("message"))
+                gids.append(None)
+        logger.debug("Added %d of %d downloads", sum(gid is not None for gid in gids), len(urls))
+        return gids
+
+    @staticmethod
+    def _download_options(options: Optional[Dict] = None) -> Dict:
+        """Default aria2c options merged with per-call overrides."""
+        default_options = {
+            "dir": str(settings.downloads_incomplete_path),
+            "max-connection-per-server": "16",
+            "split": "16",
+            "min-split-size": "1M",
+            "continue": "true",
+        }
+
+        if settings.max_download_speed > 0:
+            default_options["max-download-limit"] = str(settings.max_download_speed * 1024)
+
+        if options:
+            default_options.update(options)
+        return default_options
 
     def get_download(self, gid: str) -> Optional[aria2p.Download]:
         """
@@ -92,7 +172,7 @@ class Aria2Service:
             downloads = self.client.get_downloads([gid])
             return downloads[0] if downloads else None
         except Exception as e:
-            logger.error(f"Failed to get download {gid}: {e}")
+            logger.error("Failed to get download %s: %s", gid, e)
             return None
 
     def get_all_downloads(self) -> List[aria2p.Download]:
@@ -105,11 +185,18 @@ class Aria2Service:
         if not self.client:
             return []
 
-        try:
-            return self.client.get_downloads()
-        except Exception as e:
-            logger.error(f"Failed to get downloads: {e}")
-            return []
+        with self._cache_lock:
+            if self._downloads_cache:
+                age = time.monotonic() - self._downloads_cache[0]
+                if age < _POLL_CACHE_TTL:
+                    return list(self._downloads_cache[1])
+            try:
+                downloads = self.client.get_downloads()
+            except Exception as e:
+                logger.error("Failed to get downloads: %s", e)
+                return []
+            self._downloads_cache = (time.monotonic(), downloads)
+            return list(downloads)
 
     def pause_download(self, gid: str) -> bool:
         """
@@ -128,11 +215,11 @@ class Aria2Service:
             download = self.get_download(gid)
             if download:
                 download.pause()
-                logger.info(f"Paused download {gid}")
+                logger.info("Paused download %s", gid)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Failed to pause download {gid}: {e}")
+            logger.error("Failed to pause download %s: %s", gid, e)
             return False
 
     def resume_download(self, gid: str) -> bool:
@@ -152,11 +239,11 @@ class Aria2Service:
             download = self.get_download(gid)
             if download:
                 download.resume()
-                logger.info(f"Resumed download {gid}")
+                logger.info("Resumed download %s", gid)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Failed to resume download {gid}: {e}")
+            logger.error("Failed to resume download %s: %s", gid, e)
             return False
 
     def remove_download(self, gid: str, force: bool = False) -> bool:
@@ -180,11 +267,11 @@ class Aria2Service:
                     download.remove(force=True)
                 else:
                     download.remove()
-                logger.info(f"Removed download {gid}")
+                logger.info("Removed download %s", gid)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Failed to remove download {gid}: {e}")
+            logger.error("Failed to remove download %s: %s", gid, e)
             return False
 
     def get_download_status(self, gid: str) -> Optional[Dict]:
@@ -200,7 +287,95 @@ class Aria2Service:
         download = self.get_download(gid)
         if not download:
             return None
+        return self._status_dict(download)
+
+    def get_download_statuses(self, gids: List[str]) -> Dict[str, Dict]:
+        """
+        Get detailed status of several downloads in one RPC round trip.
+
+        Args:
+            gids: Download GIDs
+
+        Returns:
+            dict: Status information keyed by GID (unknown GIDs are omitted)
+        """
+        if not self.client or not gids:
+            return {}
+
+        try:
+            results = self.client.client.multicall2(
+                [(aria2p.Client.TELL_STATUS, [gid, _STATUS_KEYS]) for gid in gids]
+            )
+        except Exception as e:
+            logger.error("Failed to get status for %d downloads: %s", len(gids), e)
+            return {}
+
+        statuses = {}
+        for gid, result in zip(gids, results):
+            # Successful calls are wrapped in a list, failures are fault dicts
+            if not isinstance(result, list):
+                logger.warning("Failed to get status for %s: %s", gid, result.get("message"))
+                continue
+            statuses[gid] = self._parse_status(result[0])
+        return statuses
+
+    def get_all_statuses(self) -> Dict[str, Dict]:
+        """
+        Get the status of every download aria2c knows about.
+
+        Active, waiting and stopped downloads are enumerated in one multicall.
+
+        Returns:
+            dict: Status information keyed by GID
+        """
+        if not self.client:
+            return {}
+
+        try:
+            results = self.client.client.multicall2([
+                (aria2p.Client.TELL_ACTIVE, [_STATUS_KEYS]),
+                (aria2p.Client.TELL_WAITING, [0, _MAX_LISTED, _STATUS_KEYS]),
+                (aria2p.Client.TELL_STOPPED, [0, _MAX_LISTED, _STATUS_KEYS]),
+            ])
+        except Exception as e:
+            logger.error("Failed to get download statuses: %s", e)
+            return {}
 
+        statuses = {}
+        for result in results:
+            if not isinstance(result, list):
+                logger.warning("Failed to list downloads: %s", result.get("message"))
+                continue
+            for struct in result[0]:
+                statuses[struct["gid"]] = self._parse_status(struct)
+        return statuses
+
+    @staticmethod
+    def _parse_status(struct: Dict) -> Dict:
+        """Build a status dict from a raw (key-restricted) tellStatus struct."""
+        total = int(struct.get("totalLength", 0))
+        completed = int(struct.get("completedLength", 0))
+        files = [
+            {
+                "path": f["path"],
+                "length": int(f.get("length", 0)),
+                "completed_length": int(f.get("completedLength", 0)),
+            }
+            for f in struct.get("files", [])
+        ]
+        return {
+            "gid": struct["gid"],
+            "status": struct.get("status", ""),
+            "total_length": total,
+            "completed_length": completed,
+            "download_speed": int(struct.get("downloadSpeed", 0)),
+            "progress": completed / total * 100 if total else 0.0,
+            "name": Path(files[0]["path"]).name if files and files[0]["path"] else "",
+            "files": files,
+        }
+
+    def _status_dict(self, download: aria2p.Download) -> Optional[Dict]:
+        """Build the status dict returned by the status getters."""
         try:
             return {
                 "gid": download.gid,
@@ -210,11 +385,11 @@ class Aria2Service:
                 "download_speed": download.download_speed,
                 "upload_speed": download.upload_speed,
                 "progress": download.progress,
-                "eta": download.eta_string,
+                "eta": download.eta_string(),
                 "name": download.name,
                 "files": [
                     {
-                        "path": f.path,
+                        "path": str(f.path),
                         "length": f.length,
                         "completed_length": f.completed_length,
                     }
@@ -222,7 +397,7 @@ class Aria2Service:
                 ],
             }
         except Exception as e:
-            logger.error(f"Failed to get status for {gid}: {e}")
+            logger.error("Failed to get status for %s: %s", download.gid, e)
             return None
 
     def get_global_stats(self) -> Dict:
@@ -235,18 +410,28 @@ class Aria2Service:
         if not self.client:
             return {}
 
-        try:
-            stats = self.client.get_stats()
-            return {
-                "download_speed": stats.download_speed,
-                "upload_speed": stats.upload_speed,
-                "num_active": stats.num_active,
-                "num_waiting": stats.num_waiting,
-                "num_stopped": stats.num_stopped,
-            }
-        except Exception as e:
-            logger.error(f"Failed to get global stats: {e}")
-            return {}
+        with self._cache_lock:
+            if self._stats_cache and time.monotonic() - self._stats_cache[0] < _POLL_CACHE_TTL:
+                return dict(self._stats_cache[1])
+            try:
+                stats = self.client.get_stats()
+                result = {
+                    "download_speed": stats.download_speed,
+                    "upload_speed": stats.upload_speed,
+                    "num_active": stats.num_active,
+                    "num_waiting": stats.num_waiting,
+                    "num_stopped": stats.num_stopped,
+                }
+            except Exception as e:
+                logger.error("Failed to get global stats: %s", e)
+                return {}
+            self._stats_cache = (time.monotonic(), result)
+            return dict(result)
+
+    def close(self) -> None:
+        """Close pooled RPC connections."""
+        if self.client:
+            self.client.client.session.close()
 
 
 # Global instance
@@ -264,3 +449,11 @@ def get_aria2_service() -> Aria2Service:
     if _aria2_service is None:
         _aria2_service = Aria2Service()
     return _aria2_service
+
+
+def close_aria2_service() -> None:
+    """Close the aria2c service instance if one was created."""
+    global _aria2_service
+    if _aria2_service is not None:
+        _aria2_service.close()
+        _aria2_service = None
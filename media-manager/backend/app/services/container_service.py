@@ -1,16 +1,33 @@
 """Container service for managing download packages."""
 
 import logging
+import re
+from functools import lru_cache
 from typing import List, Optional
-from sqlalchemy.orm import Session
 
+import orjson
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.cache import CONTAINER_STATS_KEY, invalidate
 from app.models.container import Container
 from app.models.download import Download
 from app.services.link_grabber_service import LinkGrabberService
-from app.services.download_service import DownloadService
+from app.services.download_service import INVALID_URL_ERROR, DownloadService
+from app.workers.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
+# Container states whose counters still depend on their downloads
+ACTIVE_CONTAINER_STATUSES = frozenset({"active", "pending"})
+
+# Download states counted as still in progress for a container
+_IN_PROGRESS_DOWNLOAD_STATUSES = ("downloading", "queued", "pending")
+
+# Characters not allowed in folder names (including control characters), each replaced by "_"
+_INVALID_FOLDER_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
 
 class ContainerService:
     """Service for managing download containers (packages)."""
@@ -28,7 +45,10 @@ class ContainerService:
         custom_folder: Optional[str] = None,
     ) -> Container:
         """
-        Create a container from a URL (FileCrypt.cc, etc.) and extract all links.
+        Create a container from a URL (FileCrypt.cc, etc.) and queue link extraction.
+
+        The container is stored with status "extracting" and the extraction
+        job is handed to a Celery worker, so the request returns immediately.
 
         Args:
             url: Container URL
@@ -37,81 +57,110 @@ class ContainerService:
             custom_folder: Optional custom folder name
 
         Returns:
-            Created container with all downloads
+            Created container (links are added by the worker)
         """
         try:
-            logger.info(f"Creating container from URL: {url}")
+            logger.info("Creating container from URL: %s", url)
+
+            container = Container(
+                name=custom_name or url,
+                url=url,
+                folder_name=custom_folder,
+                total_links=0,
+                status="extracting",
+            )
+            self.db.add(container)
+            # The worker reads the container, so it must be committed before queueing
+            self.db.commit()
+            invalidate(CONTAINER_STATS_KEY)
+        except Exception as e:
+            logger.error("Failed to create container from URL: %s", e)
+            self.db.rollback()
+            raise
 
+        try:
+            celery_app.send_task(
+                "extract_container",
+                args=[container.id, premium_account_id, custom_name, custom_folder],
+                retry=False,
+                # Results are never read; skip the result backend so an
+                # unreachable Redis fails fast into the inline fallback
+                ignore_result=True,
+            )
+            logger.info("Queued link extraction for container %s", container.id)
+        except Exception as e:
+            # No broker available: fall back to extracting in-process
+            logger.warning("Could not queue extraction for container %s: %s", container.id, e)
+            self.extract_container_links(
+                container.id,
+                premium_account_id=premium_account_id,
+                custom_name=custom_name,
+                custom_folder=custom_folder,
+            )
+
+        return container
+
+    def extract_container_links(
+        self,
+        container_id: int,
+        premium_account_id: Optional[int] = None,
+        custom_name: Optional[str] = None,
+        custom_folder: Optional[str] = None,
+    ) -> Optional[Container]:
+        """
+        Extract all links of a container and create its downloads.
+
+        Args:
+            container_id: Container ID
+            premium_account_id: Optional premium account to use for downloads
+            custom_name: Optional custom name for the container
+            custom_folder: Optional custom folder name
+
+        Returns:
+            Updated container or None if not found
+        """
+        container = self.db.get(Container, container_id)
+        if not container:
+            return None
+
+        # GIDs accepted by aria2c, removed again if the commit below fails
+        submitted: List[Optional[str]] = []
+        try:
             # Extract links from URL
-            extracted = self.link_grabber.extract_links(url)
+            extracted = self.link_grabber.extract_links(container.url)
+
+            container.name = custom_name or extracted["name"]
+            container.source = extracted["source"]
+            container.folder_name = custom_folder or self._sanitize_folder_name(extracted["name"])
 
             # Check if captcha is required - JDownloader style
             if extracted.get("requires_captcha"):
-                logger.info(f"Container requires captcha: {extracted.get('captcha_type')}")
-                container = Container(
-                    name=custom_name or extracted["name"],
-                    url=url,
-                    source=extracted["source"],
-                    folder_name=custom_folder or self._sanitize_folder_name(extracted["name"]),
-                    total_links=0,
-                    status="pending_captcha",
-                    description=f"Captcha required: {extracted.get('captcha_type')}",
-                    extra_data=str(extracted),
-                )
-                self.db.add(container)
+                logger.info("Container requires captcha: %s", extracted.get("captcha_type"))
+                container.status = "pending_captcha"
+                container.description = f"Captcha required: {extracted.get('captcha_type')}"
+                container.extra_data = orjson.dumps(extracted, default=str).decode()
                 self.db.commit()
-                self.db.refresh(container)
-                logger.info(f"Container {container.id} waiting for captcha resolution")
+                logger.info("Container %s waiting for captcha resolution", container.id)
+                invalidate(CONTAINER_STATS_KEY)
                 return container
 
             # Check if password is required
             if extracted.get("requires_password"):
                 logger.info("Container requires password")
-                container = Container(
-                    name=custom_name or extracted["name"],
-                    url=url,
-                    source=extracted["source"],
-                    folder_name=custom_folder or self._sanitize_folder_name(extracted["name"]),
-                    total_links=0,
-                    status="pending_password",
-                    description="Password required",
-                    extra_data=str(extracted),
-                )
-                self.db.add(container)
+                container.status = "pending_password"
+                container.description = "Password required"
+                container.extra_data = orjson.dumps(extracted, default=str).decode()
                 self.db.commit()
-                self.db.refresh(container)
-                logger.info(f"Container {container.id} waiting for password")
+                logger.info("Container %s waiting for password", container.id)
+                invalidate(CONTAINER_STATS_KEY)
                 return container
 
-            # Create container with extracted links
-            container = Container(
-                name=custom_name or extracted["name"],
-                url=url,
-                source=extracted["source"],
-                folder_name=custom_folder or self._sanitize_folder_name(extracted["name"]),
-                total_links=extracted["total_links"],
-                password=extracted.get("password"),
-                status="pending",
-            )
+            container.total_links = extracted["total_links"]
+            container.password = extracted.get("password")
+            logger.info("Extracted container %s: %s", container.id, container.name)
 
-            self.db.add(container)
-            self.db.commit()
-            self.db.refresh(container)
-
-            logger.info(f"Created container {container.id}: {container.name}")
-
-            # Add all downloads
-            for link_url in extracted["links"]:
-                try:
-                    download = self.download_service.add_download(
-                        url=link_url,
-                        premium_account_id=premium_account_id,
-                        container_id=container.id,
-                    )
-                    logger.info(f"Added download {download.id} to container {container.id}")
-                except Exception as e:
-                    logger.error(f"Failed to add download {link_url}: {e}")
-                    container.failed_links += 1
+            # Add all downloads (committed together with the container below)
+            submitted = self._add_links(container, extracted["links"], premium_account_id)
 
             # Update container status
             if container.total_links > 0:
@@ -120,13 +169,18 @@ class ContainerService:
                 container.status = "failed"
 
             self.db.commit()
-            self.db.refresh(container)
 
+            invalidate(CONTAINER_STATS_KEY)
             return container
 
         except Exception as e:
-            logger.error(f"Failed to create container from URL: {e}")
+            logger.error("Failed to extract container %s: %s", container_id, e)
             self.db.rollback()
+            self.download_service.discard_submitted(submitted)
+            container.status = "failed"
+            container.description = f"Link extraction failed: {e}"
+            self.db.commit()
+            invalidate(CONTAINER_STATS_KEY)
             raise
 
     def create_container_manual(
@@ -138,7 +192,10 @@ class ContainerService:
         password: Optional[str] = None,
     ) -> Container:
         """
-        Create a container manually with direct download links.
+        Create a container manually with direct download links and queue their submission.
+
+        The container is stored with status "queued_submission" and adding the
+        downloads (database rows plus aria2c) is handed to a Celery worker.
 
         Args:
             name: Container name
@@ -148,39 +205,69 @@ class ContainerService:
             password: Optional archive password
 
         Returns:
-            Created container with all downloads
+            Created container (downloads are added by the worker)
         """
         try:
-            logger.info(f"Creating manual container: {name} with {len(urls)} URLs")
+            logger.info("Creating manual container: %s with %d URLs", name, len(urls))
 
-            # Create container
             container = Container(
                 name=name,
                 source="manual",
                 folder_name=folder_name or self._sanitize_folder_name(name),
                 total_links=len(urls),
                 password=password,
-                status="pending",
+                status="queued_submission",
             )
-
             self.db.add(container)
             self.db.commit()
-            self.db.refresh(container)
-
-            logger.info(f"Created container {container.id}: {container.name}")
-
-            # Add all downloads
-            for url in urls:
-                try:
-                    download = self.download_service.add_download(
-                        url=url,
-                        premium_account_id=premium_account_id,
-                        container_id=container.id,
-                    )
-                    logger.info(f"Added download {download.id} to container {container.id}")
-                except Exception as e:
-                    logger.error(f"Failed to add download {url}: {e}")
-                    container.failed_links += 1
+            invalidate(CONTAINER_STATS_KEY)
+            logger.info("Created container %s: %s", container.id, container.name)
+        except Exception as e:
+            logger.error("Failed to create manual container: %s", e)
+            self.db.rollback()
+            raise
+
+        try:
+            celery_app.send_task(
+                "submit_container_links",
+                args=[container.id, urls, premium_account_id],
+                retry=False,
+                ignore_result=True,
+            )
+            logger.info("Queued link submission for container %s", container.id)
+        except Exception as e:
+            # No broker available: fall back to submitting in-process
+            logger.warning("Could not queue submission for container %s: %s", container.id, e)
+            self.submit_container_links(container.id, urls, premium_account_id=premium_account_id)
+
+        return container
+
+    def submit_container_links(
+        self,
+        container_id: int,
+        urls: List[str],
+        premium_account_id: Optional[int] = None,
+    ) -> Optional[Container]:
+        """
+        Create the downloads of a manual container and submit them to aria2c.
+
+        Args:
+            container_id: Container ID
+            urls: List of download URLs
+            premium_account_id: Optional premium account to use
+
+        Returns:
+            Updated container or None if not found
+        """
+        container = self.get_container(container_id)
+        if not container:
+            return None
+
+        # GIDs accepted by aria2c, removed again if the commit below fails
+        submitted: List[Optional[str]] = []
+        try:
+            # Add all downloads (committed together with the container below)
+            submitted = self._add_links(container, urls, premium_account_id)
 
             # Update container status
             if container.total_links > 0:
@@ -189,45 +276,115 @@ class ContainerService:
                 container.status = "failed"
 
             self.db.commit()
-            self.db.refresh(container)
 
+            invalidate(CONTAINER_STATS_KEY)
             return container
 
         except Exception as e:
-            logger.error(f"Failed to create manual container: {e}")
+            logger.error("Failed to submit links of container %s: %s", container_id, e)
             self.db.rollback()
+            self.download_service.discard_submitted(submitted)
+            container.status = "failed"
+            container.description = f"Link submission failed: {e}"
+            self.db.commit()
+            invalidate(CONTAINER_STATS_KEY)
             raise
 
-    def get_container(self, container_id: int) -> Optional[Container]:
-        """Get container by ID."""
-        return self.db.query(Container).filter(Container.id == container_id).first()
+    def _add_links(
+        self,
+        container: Container,
+        urls: List[str],
+        premium_account_id: Optional[int],
+    ) -> List[Optional[str]]:
+        """
+        Bulk-insert the downloads of a container, storing rejected URLs as failed downloads.
+
+        Returns:
+            aria2c GIDs of the new downloads, to remove if the caller's commit fails
+        """
+        # Every link gets a row, so the download aggregates always add up to total_links
+        downloads = self.download_service.bulk_add_downloads(
+            urls=urls,
+            premium_account_id=premium_account_id,
+            container_id=container.id,
+            commit=False,
+            record_rejected=True,
+        )
+        rejected = sum(d.error_message == INVALID_URL_ERROR for d in downloads)
+        container.failed_links += rejected
+        # One summary line per container; per-download details are logged at debug level
+        logger.info(
+            "Added %d downloads to container %s (%d rejected, %d not accepted by aria2c)",
+            len(downloads),
+            container.id,
+            rejected,
+            sum(d.aria2_gid is None for d in downloads),
+        )
+        return [d.aria2_gid for d in downloads]
+
+    def get_container(self, container_id: int, with_downloads: bool = False) -> Optional[Container]:
+        """
+        Get container by ID.
+
+        Args:
+            container_id: Container ID
+            with_downloads: Eagerly load the downloads and their file paths with one
+                extra SELECT ... IN
+
+        Returns:
+            Container or None
+        """
+        if not with_downloads:
+            return self.db.get(Container, container_id)
+        return (
+            self.db.query(Container)
+            .options(
+                selectinload(Container.downloads).joinedload(Download.file_path_ref),
+                raiseload("*"),
+            )
+            .filter(Container.id == container_id)
+            .first()
+        )
 
     def list_containers(
         self,
         status: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0,
+        before_id: Optional[int] = None,
+        refresh_active: bool = False,
     ) -> List[Container]:
         """
-        List containers with optional filtering.
+        List containers with optional filtering, newest first.
 
         Args:
             status: Filter by status
             limit: Maximum number of results
-            offset: Offset for pagination
+            before_id: Only return containers with a lower ID (keyset pagination)
+            refresh_active: Re-derive the status of active containers on the page
 
         Returns:
             List of containers
         """
-        query = self.db.query(Container)
+        # List views never serialize downloads; fail loudly instead of lazy-loading them
+        query = self.db.query(Container).options(raiseload(Container.downloads))
 
         if status:
             query = query.filter(Container.status == status)
+        if before_id is not None:
+            query = query.filter(Container.id < before_id)
 
-        query = query.order_by(Container.created_at.desc())
-        query = query.limit(limit).offset(offset)
+        # IDs grow with insertion, so this is creation order served by an index seek
+        query = query.order_by(Container.id.desc())
+        query = query.limit(limit)
 
-        return query.all()
+        containers = query.all()
+
+        if refresh_active and (status is None or status in ACTIVE_CONTAINER_STATUSES):
+            self.bulk_update_statuses(
+                [c for c in containers if c.status in ACTIVE_CONTAINER_STATUSES]
+            )
+
+        return containers
 
     def update_container_status(self, container_id: int) -> Optional[Container]:
         """
@@ -243,36 +400,147 @@ class ContainerService:
         if not container:
             return None
 
-        # Count download statuses
-        completed = 0
-        failed = 0
-        active = 0
+        # Finished or still preparing (extracting, waiting for captcha, ...):
+        # download counts do not drive the status
+        if container.status not in ACTIVE_CONTAINER_STATUSES:
+            return container
+
+        # Aggregate download states in SQL instead of loading every download
+        _, total_links, completed, failed, active = self._count_download_states([container_id])[0]
+        status = self._derive_status(total_links, completed, failed, active)
 
-        for download in container.downloads:
-            if download.status == "completed":
-                completed += 1
-            elif download.status == "failed":
-                failed += 1
-            elif download.status in ["downloading", "queued", "pending"]:
-                active += 1
+        if (container.completed_links, container.failed_links, container.status) == (
+            completed,
+            failed,
+            status,
+        ):
+            return container
 
         # Update container
         container.completed_links = completed
         container.failed_links = failed
-
-        # Update status
-        if completed == container.total_links:
-            container.status = "completed"
-        elif failed == container.total_links:
-            container.status = "failed"
-        elif active > 0:
-            container.status = "active"
-        else:
-            container.status = "pending"
+        container.status = status
 
         self.db.commit()
+        invalidate(CONTAINER_STATS_KEY)
         return container
 
+    def bulk_update_statuses(self, containers: List[Container]) -> None:
+        """
+        Update status of several loaded containers at once.
+
+        Download states are aggregated per container in a single query and
+        only the containers whose counters or status changed are written back
+        with one bulk UPDATE by primary key.
+
+        Args:
+            containers: Containers loaded in this session
+        """
+        if not containers:
+            return
+
+        by_id = {container.id: container for container in containers}
+        mappings = []
+        for container_id, total_links, completed, failed, active in self._count_download_states(
+            list(by_id)
+        ):
+            container = by_id[container_id]
+            status = self._derive_status(total_links, completed, failed, active)
+            if (container.completed_links, container.failed_links, container.status) != (
+                completed,
+                failed,
+                status,
+            ):
+                mappings.append(
+                    {
+                        "id": container_id,
+                        "completed_links": completed,
+                        "failed_links": failed,
+                        "status": status,
+                    }
+                )
+        if not mappings:
+            return
+
+        self.db.execute(update(Container), mappings)
+        self.db.commit()
+        # Keep the loaded objects in step without reloading them
+        for mapping in mappings:
+            container = by_id[mapping["id"]]
+            for key in ("completed_links", "failed_links", "status"):
+                set_committed_value(container, key, mapping[key])
+        invalidate(CONTAINER_STATS_KEY)
+
+    def _count_download_states(self, container_ids: List[int]) -> list:
+        """
+        Count download states per container in one aggregate query.
+
+        Counts are 0 (not NULL) for containers without downloads.
+
+        Args:
+            container_ids: Container IDs
+
+        Returns:
+            Rows of (container ID, total links, completed, failed, in progress)
+        """
+        return self.db.execute(
+            select(
+                Container.id,
+                Container.total_links,
+                func.count(case((Download.status == "completed", 1))),
+                func.count(case((Download.status == "failed", 1))),
+                func.count(case((Download.status.in_(_IN_PROGRESS_DOWNLOAD_STATUSES), 1))),
+            )
+            .outerjoin(Download, Download.container_id == Container.id)
+            .where(Container.id.in_(container_ids))
+            .group_by(Container.id)
+        ).all()
+
+    @staticmethod
+    def _derive_status(total_links: int, completed: int, failed: int, active: int) -> str:
+        """
+        Derive container status from download counts.
+
+        Args:
+            total_links: Number of links in the container
+            completed: Completed downloads
+            failed: Failed downloads
+            active: Downloads still in progress
+
+        Returns:
+            Container status
+        """
+        if completed == total_links:
+            return "completed"
+        elif failed == total_links:
+            return "failed"
+        elif active > 0:
+            return "active"
+        elif completed and completed + failed == total_links:
+            # Every link finished, some of them failed (counted in failed_links)
+            return "completed"
+        return "pending"
+
+    def get_stats(self) -> dict:
+        """
+        Get container statistics.
+
+        Returns:
+            dict: Container counts by status
+        """
+        counts = dict(
+            self.db.execute(
+                select(Container.status, func.count()).group_by(Container.status)
+            ).all()
+        )
+
+        return {
+            "total_containers": sum(counts.values()),
+            "active_containers": counts.get("active", 0),
+            "completed_containers": counts.get("completed", 0),
+            "failed_containers": counts.get("failed", 0),
+        }
+
     def delete_container(self, container_id: int) -> bool:
         """
         Delete container and all associated downloads.
@@ -283,15 +551,19 @@ class ContainerService:
         Returns:
             True if deleted, False if not found
         """
-        container = self.get_container(container_id)
+        # The delete cascade needs the downloads; load them in one query
+        container = self.get_container(container_id, with_downloads=True)
         if not container:
             return False
 
         self.db.delete(container)
         self.db.commit()
+        invalidate(CONTAINER_STATS_KEY)
         return True
 
-    def _sanitize_folder_name(self, name: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _sanitize_folder_name(name: str) -> str:
         """
         Sanitize folder name by removing invalid characters.
 
@@ -301,16 +573,5 @@ class ContainerService:
         Returns:
             Sanitized folder name
         """
-        # Remove invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, "_")
-
-        # Remove leading/trailing spaces and dots
-        name = name.strip(" .")
-
-        # Limit length
-        if len(name) > 200:
-            name = name[:200]
-
-        return name or "container"
+        # Replace invalid characters, strip leading/trailing spaces and dots, limit length
+        return _INVALID_FOLDER_CHARS.sub("_", name).strip(" .")[:200] or "container"
@@ -1,15 +1,48 @@
 """Download management service."""
 
 import logging
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from urllib.parse import urlparse
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.cache import ARIA2_STATUS_KEY, get_many, set_many
 from app.models import Download, DownloadStatus
 from app.services.aria2_service import get_aria2_service
+from app.services.path_service import PathService
+from app.services.progress_buffer import progress_buffer
 
 logger = logging.getLogger(__name__)
 
+# Download states that are synced from aria2c
+ACTIVE_DOWNLOAD_STATUSES = frozenset({
+    DownloadStatus.QUEUED.value,
+    DownloadStatus.DOWNLOADING.value,
+    DownloadStatus.PAUSED.value,
+})
+
+# aria2c states that map onto our download states (others leave the status as is)
+_ARIA2_STATUS_MAP = {
+    "active": DownloadStatus.DOWNLOADING.value,
+    "complete": DownloadStatus.COMPLETED.value,
+    "error": DownloadStatus.FAILED.value,
+    "paused": DownloadStatus.PAUSED.value,
+}
+
+# Seconds an aria2c status is shared between pollers
+_STATUS_CACHE_TTL = 2
+
+# Weight of the newest aria2c speed sample in the displayed moving average
+_SPEED_SMOOTHING = 0.3
+
+# URL schemes aria2c can download
+_SUPPORTED_SCHEMES = frozenset({"http", "https", "ftp", "sftp"})
+
+# Error message of downloads stored for rejected URLs
+INVALID_URL_ERROR = "Unsupported URL"
+
 
 class DownloadService:
     """Service for managing downloads."""
@@ -49,8 +82,8 @@ class DownloadService:
             container_id=container_id,
         )
         self.db.add(download)
-        self.db.commit()
-        self.db.refresh(download)
+        # Only the ID is needed before aria2c; the row is committed with its outcome below
+        self.db.flush()
 
         # Add to aria2c
         gid = self.aria2.add_download(url)
@@ -58,15 +91,115 @@ class DownloadService:
             download.aria2_gid = gid
             download.status = DownloadStatus.QUEUED.value
             self.db.commit()
-            logger.info(f"Download added: {url} (ID: {download.id}, GID: {gid})")
+            logger.info("Download added: %s (ID: %s, GID: %s)", url, download.id, gid)
         else:
             download.status = DownloadStatus.FAILED.value
             download.error_message = "Failed to add to aria2c"
             self.db.commit()
-            logger.error(f"Failed to add download to aria2c: {url}")
+            logger.error("Failed to add download to aria2c: %s", url)
 
         return download
 
+    def bulk_add_downloads(
+        self,
+        urls: List[str],
+        premium_account_id: Optional[int] = None,
+        container_id: Optional[int] = None,
+        commit: bool = True,
+        record_rejected: bool = False,
+    ) -> List[Download]:
+        """
+        Add multiple downloads in a single transaction.
+
+        URLs are validated up front; all valid ones are inserted with one
+        multi-row INSERT ... RETURNING, submitted to aria2c with one
+        multicall and their aria2c state is written back with one bulk UPDATE.
+
+        Args:
+            urls: Download URLs
+            premium_account_id: Optional premium account ID
+            container_id: Optional container ID for grouping
+            commit: Commit the transaction; pass False to let the caller
+                commit it together with its own changes (on failure the
+                caller removes the returned GIDs with ``discard_submitted``)
+            record_rejected: Store invalid URLs as failed downloads instead of
+                skipping them (containers count every link they were given)
+
+        Returns:
+            List[Download]: Created download objects
+        """
+        rows = []
+        for url in urls:
+            url = url.strip()
+            row = {
+                "url": url,
+                "status": DownloadStatus.PENDING.value,
+                "premium_account_id": premium_account_id,
+                "container_id": container_id,
+            }
+            if urlparse(url).scheme.lower() in _SUPPORTED_SCHEMES:
+                rows.append(row)
+            elif record_rejected:
+                logger.error("Rejecting invalid download URL: %r", url)
+                row["status"] = DownloadStatus.FAILED.value
+                row["error_message"] = INVALID_URL_ERROR
+                rows.append(row)
+            else:
+                logger.error("Skipping invalid download URL: %r", url)
+
+        if not rows:
+            return []
+
+        gids: List[Optional[str]] = []
+        try:
+            created = self.db.scalars(insert(Download).returning(Download), rows).all()
+            downloads = [d for d in created if d.status == DownloadStatus.PENDING.value]
+
+            # Add to aria2c in one multicall
+            gids = self.aria2.add_downloads_bulk([download.url for download in downloads])
+            updates = []
+            for download, gid in zip(downloads, gids):
+                if gid:
+                    updates.append({
+                        "id": download.id,
+                        "aria2_gid": gid,
+                        "status": DownloadStatus.QUEUED.value,
+                        "error_message": None,
+                    })
+                else:
+                    updates.append({
+                        "id": download.id,
+                        "aria2_gid": None,
+                        "status": DownloadStatus.FAILED.value,
+                        "error_message": "Failed to add to aria2c",
+                    })
+
+            if updates:
+                self.db.execute(update(Download), updates)
+            if commit:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            # aria2c already accepted the URLs; do not leave them without a row
+            self.discard_submitted(gids)
+            raise
+
+        logger.debug("Added %d downloads", len(downloads))
+        return list(created)
+
+    def discard_submitted(self, gids: List[Optional[str]]) -> None:
+        """
+        Remove downloads from aria2c whose database rows were rolled back.
+
+        Best effort: removal failures are logged by the aria2c service.
+
+        Args:
+            gids: aria2c GIDs (None entries are ignored)
+        """
+        for gid in gids:
+            if gid:
+                self.aria2.remove_download(gid, force=True)
+
     def get_download(self, download_id: int) -> Optional[Download]:
         """
         Get download by ID.
@@ -77,7 +210,8 @@ class DownloadService:
         Returns:
             Download object or None
         """
-        return self.db.query(Download).filter(Download.id == download_id).first()
+        # Identity-map hit when the download is already in the session
+        return self.db.get(Download, download_id)
 
     def get_download_by_gid(self, gid: str) -> Optional[Download]:
         """
@@ -95,26 +229,30 @@ class DownloadService:
         self,
         status: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0,
+        before_id: Optional[int] = None,
     ) -> List[Download]:
         """
-        List downloads with optional filtering.
+        List downloads with optional filtering, newest first.
 
         Args:
             status: Filter by status
             limit: Maximum number of results
-            offset: Offset for pagination
+            before_id: Only return downloads with a lower ID (keyset pagination)
 
         Returns:
             List of downloads
         """
-        query = self.db.query(Download)
+        # List views never serialize the container; fail loudly instead of lazy-loading it
+        query = self.db.query(Download).options(raiseload(Download.container))
 
         if status:
             query = query.filter(Download.status == status)
+        if before_id is not None:
+            query = query.filter(Download.id < before_id)
 
-        query = query.order_by(Download.created_at.desc())
-        return query.offset(offset).limit(limit).all()
+        # IDs grow with insertion, so this is creation order served by an index seek
+        query = query.order_by(Download.id.desc())
+        return query.limit(limit).all()
 
     def update_download_status(self, download_id: int) -> Optional[Download]:
         """
@@ -130,35 +268,159 @@ class DownloadService:
         if not download or not download.aria2_gid:
             return None
 
-        # Get status from aria2c
-        status = self.aria2.get_download_status(download.aria2_gid)
-        if not status:
-            return download
+        self.refresh_statuses([download])
+        return download
+
+    def refresh_statuses(self, downloads: List[Download]) -> None:
+        """
+        Sync several downloads from aria2c with a single multicall.
+
+        Statuses are cached in Redis for a short time so concurrent pollers
+        share one aria2c round trip.
+
+        Args:
+            downloads: Downloads to refresh (entries without a GID are skipped)
+        """
+        by_gid = {d.aria2_gid: d for d in downloads if d.aria2_gid}
+        if not by_gid:
+            return
+
+        keys = {gid: ARIA2_STATUS_KEY.format(gid=gid) for gid in by_gid}
+        cached_statuses = get_many(list(keys.values()))
+        statuses = {
+            gid: cached_statuses[key] for gid, key in keys.items() if key in cached_statuses
+        }
+
+        missing = [gid for gid in by_gid if gid not in statuses]
+        if missing:
+            fetched = self.aria2.get_download_statuses(missing)
+            # Smooth each new sample once; pollers sharing the cached entry reuse the result
+            for gid, status in fetched.items():
+                self._smooth_speed(status, previous_speed=by_gid[gid].speed or 0.0)
+            set_many({keys[gid]: status for gid, status in fetched.items()}, ttl=_STATUS_CACHE_TTL)
+            statuses.update(fetched)
+
+        transitions = []
+        for gid, status in statuses.items():
+            download = by_gid[gid]
+            new_status = _ARIA2_STATUS_MAP.get(status.get("status", ""), download.status)
+            if new_status == download.status:
+                # Progress-only tick: show it now, write it with the next buffer flush
+                fields = self._progress_fields(status)
+                progress_buffer.put(download.id, fields)
+            else:
+                fields = self._status_fields(status)
+                transitions.append({"id": download.id, **fields})
+                progress_buffer.discard(download.id)
+            # Values are written by Core statements; keep the objects in step without dirtying them
+            # (file paths are interned first, see _intern_file_paths)
+            for key, value in fields.items():
+                if key != "file_path":
+                    set_committed_value(download, key, value)
+
+        if transitions:
+            self._intern_file_paths(transitions, by_gid.values())
+            self.db.execute(update(Download), transitions)
+            self.db.commit()
+
+    def _intern_file_paths(self, transitions: List[dict], downloads: Iterable[Download]) -> None:
+        """Replace ``file_path`` values of transition mappings with interned path IDs."""
+        paths = [mapping["file_path"] for mapping in transitions if "file_path" in mapping]
+        if not paths:
+            return
+
+        interned = PathService(self.db).intern(paths)
+        by_id = {download.id: download for download in downloads}
+        for mapping in transitions:
+            if "file_path" in mapping:
+                path = interned[mapping.pop("file_path")]
+                mapping["file_path_id"] = path.id
+                set_committed_value(by_id[mapping["id"]], "file_path_id", path.id)
+                set_committed_value(by_id[mapping["id"]], "file_path_ref", path)
+
+    def refresh_all_active(self) -> int:
+        """
+        Sync every download aria2c is still working on.
+
+        Active downloads are loaded with one query on the status index and
+        refreshed with one aria2c multicall.
+
+        Returns:
+            Number of downloads refreshed
+        """
+        downloads = self.db.scalars(
+            select(Download)
+            .options(raiseload(Download.container))
+            .where(
+                Download.status.in_(ACTIVE_DOWNLOAD_STATUSES),
+                Download.aria2_gid.is_not(None),
+            )
+        ).all()
+        self.refresh_statuses(downloads)
+        return len(downloads)
+
+    @staticmethod
+    def _smooth_speed(status: dict, previous_speed: float) -> None:
+        """
+        Add the smoothed speed and the ETA derived from it to a fresh aria2c sample.
+
+        Args:
+            status: aria2c status dict, updated in place
+            previous_speed: Speed shown so far
+        """
+        if status.get("status") != "active":
+            # Waiting, paused or finished: nothing to average and no ETA
+            status["smoothed_speed"] = status.get("download_speed", 0)
+            status["eta"] = None
+            return
+
+        speed = _SPEED_SMOOTHING * status.get("download_speed", 0) + (
+            (1 - _SPEED_SMOOTHING) * previous_speed
+        )
+        remaining = status.get("total_length", 0) - status.get("completed_length", 0)
+        status["smoothed_speed"] = speed
+        status["eta"] = int(remaining / speed) if speed >= 1 else None
 
-        # Update download
-        download.progress = status.get("progress", 0.0)
-        download.speed = status.get("download_speed", 0)
-        download.size_total = status.get("total_length", 0)
-        download.size_downloaded = status.get("completed_length", 0)
+    @staticmethod
+    def _progress_fields(status: dict) -> dict:
+        """
+        Extract the volatile progress columns from an aria2c status dict.
+
+        Args:
+            status: aria2c status dict (with ``_smooth_speed`` results, if applied)
+
+        Returns:
+            Column values
+        """
+        fields = {
+            "progress": status.get("progress", 0.0),
+            "speed": status.get("smoothed_speed", status.get("download_speed", 0)),
+            "size_total": status.get("total_length", 0),
+            "size_downloaded": status.get("completed_length", 0),
+        }
+        if "eta" in status:
+            fields["eta"] = status["eta"]
+        return fields
+
+    @classmethod
+    def _status_fields(cls, status: dict) -> dict:
+        """Column values for a download whose aria2c status changed."""
+        fields = cls._progress_fields(status)
 
         # Map aria2c status to our status
         aria2_status = status.get("status", "")
-        if aria2_status == "active":
-            download.status = DownloadStatus.DOWNLOADING.value
-        elif aria2_status == "complete":
-            download.status = DownloadStatus.COMPLETED.value
+        if aria2_status in _ARIA2_STATUS_MAP:
+            fields["status"] = _ARIA2_STATUS_MAP[aria2_status]
+        if aria2_status != "active":
+            fields["eta"] = None
+        if aria2_status == "complete":
             # Set file path from aria2c
             if status.get("files") and len(status["files"]) > 0:
-                download.file_path = str(status["files"][0]["path"])
-                download.filename = status.get("name", "")
+                fields["file_path"] = str(status["files"][0]["path"])
+                fields["filename"] = status.get("name", "")
         elif aria2_status == "error":
-            download.status = DownloadStatus.FAILED.value
-            download.error_message = "Download error in aria2c"
-        elif aria2_status == "paused":
-            download.status = DownloadStatus.PAUSED.value
-
-        self.db.commit()
-        return download
+            fields["error_message"] = "Download error in aria2c"
+        return fields
 
     def pause_download(self, download_id: int) -> bool:
         """
@@ -240,6 +502,7 @@ class DownloadService:
 
         self.db.delete(download)
         self.db.commit()
+        progress_buffer.discard(download_id)
         return True
 
     def retry_download(self, download_id: int) -> Optional[Download]:
@@ -268,7 +531,7 @@ class DownloadService:
             download.retry_count = (download.retry_count or 0) + 1
             download.error_message = None
             self.db.commit()
-            logger.info(f"Retry download {download_id} (attempt {download.retry_count})")
+            logger.info("Retry download %s (attempt %s)", download_id, download.retry_count)
             return download
         else:
             download.status = DownloadStatus.FAILED.value
@@ -287,19 +550,17 @@ class DownloadService:
         aria2_stats = self.aria2.get_global_stats()
 
         # Get from database
-        total = self.db.query(Download).count()
-        completed = self.db.query(Download).filter(
-            Download.status == DownloadStatus.COMPLETED.value
-        ).count()
-        failed = self.db.query(Download).filter(
-            Download.status == DownloadStatus.FAILED.value
-        ).count()
-        active = self.db.query(Download).filter(
-            Download.status.in_([
-                DownloadStatus.DOWNLOADING.value,
-                DownloadStatus.QUEUED.value
-            ])
-        ).count()
+        counts = dict(
+            self.db.execute(
+                select(Download.status, func.count()).group_by(Download.status)
+            ).all()
+        )
+        total = sum(counts.values())
+        completed = counts.get(DownloadStatus.COMPLETED.value, 0)
+        failed = counts.get(DownloadStatus.FAILED.value, 0)
+        active = counts.get(DownloadStatus.DOWNLOADING.value, 0) + counts.get(
+            DownloadStatus.QUEUED.value, 0
+        )
 
         return {
             "total_downloads": total,
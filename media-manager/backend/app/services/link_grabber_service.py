@@ -1,16 +1,108 @@
 """Link grabber service for extracting download links - JDownloader style."""
 
+import codecs
+import copy
 import logging
 import re
 import base64
-from typing import Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 
 import requests
 from bs4 import BeautifulSoup
+from urllib3.util import Retry
+
+try:
+    import lxml.etree
+except ImportError:  # Optional C parser; BeautifulSoup's html.parser is used instead
+    lxml = None
 
 logger = logging.getLogger(__name__)
 
+# Pooled keep-alive connections per host
+_HTTP_POOL_SIZE = 32
+
+# Largest page body read for parsing, and the read size per chunk
+_MAX_PAGE_BYTES = 5 * 1024 * 1024
+_PAGE_CHUNK_SIZE = 64 * 1024
+
+# Redirects resolved in parallel (stays below the pool size)
+_RESOLVE_CONCURRENCY = 16
+
+# FileCrypt page patterns
+_RE_CUTCAPTCHA = re.compile(r"cutcaptcha")
+_RE_LINK_REDIRECT = re.compile(r"/Link/\w+")
+_RE_CRYPTED = re.compile(r'crypted\s*[:=]\s*["\']([^"\']+)["\']')
+_RE_DLC = re.compile(r"\.dlc$", re.I)
+
+# Container sites with a dedicated parser: (host substring, method name)
+_DOMAIN_PARSERS = (("filecrypt", "_parse_filecrypt"),)
+
+# Known file hosters
+_RE_HOSTER = re.compile(r"rapidgator|uploaded|ddownload|nitro|ddl|mega|mediafire", re.I)
+
+# C-based lxml parser when installed, pure-Python parser otherwise
+_HTML_PARSER = "lxml" if lxml is not None else "html.parser"
+
+
+# Recent FileCrypt parses by (url, password): (parsed_at, result), oldest first
+_PARSE_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+_PARSE_CACHE_TTL = 30.0  # Seconds
+_PARSE_CACHE_SIZE = 128
+
+
+def _parse_cache_get(key: Tuple[str, str]) -> Optional[Dict]:
+    """Return a copy of a fresh cached parse result, or None."""
+    with _PARSE_CACHE_LOCK:
+        hit = _PARSE_CACHE.get(key)
+        if hit is None:
+            return None
+        parsed_at, result = hit
+        if time.monotonic() - parsed_at >= _PARSE_CACHE_TTL:
+            del _PARSE_CACHE[key]
+            return None
+        _PARSE_CACHE.move_to_end(key)
+    return copy.deepcopy(result)
+
+
+def _parse_cache_put(key: Tuple[str, str], result: Dict) -> None:
+    """Remember a parse result (captcha pages are not cached: they must be solved anew)."""
+    if result.get("requires_captcha"):
+        return
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE[key] = (time.monotonic(), copy.deepcopy(result))
+        _PARSE_CACHE.move_to_end(key)
+        while len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+
+
+def _declared_charset(response: requests.Response) -> Optional[str]:
+    """
+    Charset given in the Content-Type header, if any.
+
+    Unlike ``response.encoding`` this does not default text/* to ISO-8859-1,
+    and unlike ``response.text`` it never runs charset detection; pages
+    without a declared charset are left to the parser's meta-tag sniffing.
+    """
+    for param in response.headers.get("content-type", "").split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            charset = value.strip().strip("\"'")
+            try:
+                # Parsers reject unknown names; let them sniff instead
+                codecs.lookup(charset)
+            except LookupError:
+                return None
+            # Pass the name as sent: libxml2 does not know Python's canonical
+            # aliases (euc_kr, mac-roman, ...)
+            return charset
+    return None
+
 
 class LinkGrabberService:
     """Service for extracting download links - inspired by JDownloader."""
@@ -18,8 +110,22 @@ class LinkGrabberService:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Accept": "text/html,application/xhtml+xml",
         })
+        # Keep connections to the container host alive across page and redirect requests
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=_HTTP_POOL_SIZE,
+            pool_maxsize=_HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False,  # Let raise_for_status() report the final response
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def extract_links(self, url: str, password: Optional[str] = None) -> Dict[str, any]:
         """
@@ -40,13 +146,11 @@ class LinkGrabberService:
                 - captcha_type: Type of captcha (recaptcha, cutcaptcha, etc.)
                 - requires_password: Boolean
         """
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-
-        if "filecrypt" in domain:
-            return self._parse_filecrypt(url, password)
-        else:
-            return self._parse_generic(url)
+        domain = urlparse(url).netloc.casefold()
+        for needle, parse in _DOMAIN_PARSERS:
+            if needle in domain:
+                return getattr(self, parse)(url, password)
+        return self._parse_generic(url)
 
     def _parse_filecrypt(self, url: str, password: Optional[str] = None) -> Dict[str, any]:
         """
@@ -67,8 +171,14 @@ class LinkGrabberService:
         Returns:
             Dictionary with links, captcha info, and metadata
         """
+        key = (url, password or "")
+        cached = _parse_cache_get(key)
+        if cached is not None:
+            logger.info("Using cached FileCrypt parse of %s", url)
+            return cached
+
         try:
-            logger.info(f"Parsing FileCrypt container: {url}")
+            logger.info("Parsing FileCrypt container: %s", url)
 
             # Normalize URL
             if not url.endswith('.html'):
@@ -76,9 +186,8 @@ class LinkGrabberService:
                 url = f"https://filecrypt.cc/Container/{container_id}.html"
 
             # Fetch the main page
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+            content, encoding = self._fetch_page(url)
+            page = self._scan_filecrypt_page(content, url, encoding)
 
             result = {
                 "source": "filecrypt",
@@ -93,125 +202,117 @@ class LinkGrabberService:
             }
 
             # Extract container name
-            title_elem = soup.find("h1") or soup.find("title")
-            if title_elem:
-                result["name"] = title_elem.text.strip()
+            if page.name is not None:
+                result["name"] = page.name
 
             # Check for password requirement
-            password_input = soup.find("input", {"name": "password"})
-            if password_input:
+            if page.requires_password:
                 result["requires_password"] = True
                 if not password:
                     logger.info("FileCrypt container requires password")
+                    _parse_cache_put(key, result)
                     return result
 
             # Check for captcha requirement
             # FileCrypt uses: ReCaptcha, CutCaptcha, KeyCaptcha, ClickCaptcha
-            captcha_found = False
-
-            # ReCaptcha v2
-            if soup.find("div", {"class": "g-recaptcha"}):
-                result["requires_captcha"] = True
-                result["captcha_type"] = "recaptcha_v2"
-                result["captcha_url"] = url
-                captcha_found = True
-                logger.info("FileCrypt container requires ReCaptcha v2")
-
-            # CutCaptcha
-            if soup.find("iframe", src=re.compile(r"cutcaptcha")):
+            if page.captcha_type:
                 result["requires_captcha"] = True
-                result["captcha_type"] = "cutcaptcha"
+                result["captcha_type"] = page.captcha_type
                 result["captcha_url"] = url
-                captcha_found = True
-                logger.info("FileCrypt container requires CutCaptcha")
+                logger.info("FileCrypt container requires %s", page.captcha_type)
 
-            # If captcha required, return early (user must solve)
-            if captcha_found:
+                # Captcha required, return early (user must solve)
                 return result
 
-            # Try to find mirror/download links
-            # FileCrypt shows links after password/captcha
-            links = []
-
-            # Method 1: Look for mirror containers
-            # FileCrypt has multiple mirrors (rapidgator, uploaded, etc.)
-            mirror_divs = soup.find_all("div", {"class": re.compile(r"mirror|link", re.I)})
-            for div in mirror_divs:
-                # Look for data attributes or hidden inputs with URLs
-                for attr in ["data-href", "data-url", "data-link"]:
-                    if div.has_attr(attr):
-                        link_url = div[attr]
-                        if link_url and link_url.startswith("http"):
-                            links.append(link_url)
-
-            # Method 2: Look for download buttons with data attributes (FileCrypt's main method)
-            # FileCrypt uses: <button data-XXXX="link_id" onclick="openLink(...)">
-            download_buttons = soup.find_all("button", {"class": "download"})
-            for button in download_buttons:
-                # Find data-* attribute containing link ID
-                for attr, value in button.attrs.items():
-                    if attr.startswith("data-") and value:
-                        # Build /Link/ URL
-                        link_id = value
-                        redirect_url = f"/Link/{link_id}.html"
-                        full_url = urljoin(url, redirect_url)
-                        links.append(full_url)
-                        logger.info(f"Found FileCrypt link: {full_url}")
-                        break
-
-            # Method 3: Look for /Link/ redirect URLs in <a> tags
-            redirect_links = soup.find_all("a", href=re.compile(r"/Link/\w+"))
-            for elem in redirect_links:
-                href = elem.get("href", "")
-                if href:
-                    # Convert relative to absolute
-                    if not href.startswith("http"):
-                        href = urljoin(url, href)
-                    links.append(href)
-
-            # Method 3: Look for CNL (Click'n'Load) data
-            # CNL is FileCrypt's preferred method - encrypted link data in page
-            cnl_scripts = soup.find_all("script", text=re.compile(r"cnl|jdownloader", re.I))
-            for script in cnl_scripts:
-                # Look for CNL2 format
-                # Usually contains: crypted, jk, source
-                cnl_data = re.search(r'crypted\s*[:=]\s*["\']([^"\']+)["\']', script.string or "")
-                if cnl_data:
-                    try:
-                        # CNL2 uses base64 encoded data
-                        encrypted = cnl_data.group(1)
-                        # In real implementation, would decrypt with key
-                        logger.info("Found CNL2 encrypted data (decryption not implemented)")
-                        # For now, mark as found
-                        result["cnl_available"] = True
-                    except Exception as e:
-                        logger.warning(f"Failed to parse CNL data: {e}")
-
-            # Method 4: Look for DLC container download link
-            dlc_link = soup.find("a", href=re.compile(r"\.dlc$", re.I))
-            if dlc_link:
-                dlc_url = dlc_link.get("href", "")
-                if dlc_url:
-                    if not dlc_url.startswith("http"):
-                        dlc_url = urljoin(url, dlc_url)
-                    result["dlc_url"] = dlc_url
-                    logger.info(f"Found DLC container: {dlc_url}")
-
-            # Remove duplicates
-            links = list(set(links))
+            if page.cnl_available:
+                # In real implementation, would decrypt with key
+                logger.info("Found CNL2 encrypted data (decryption not implemented)")
+                result["cnl_available"] = True
+
+            if page.dlc_url:
+                result["dlc_url"] = page.dlc_url
+                logger.info("Found DLC container: %s", page.dlc_url)
+
+            links = page.links
 
             # FileCrypt /Link/ URLs need to be kept as-is
             # They redirect to the actual download hoster
-            result["links"] = links
+            result["links"] = list(links)
             result["total_links"] = len(links)
 
-            logger.info(f"Extracted {len(links)} links from FileCrypt container")
+            logger.info("Extracted %d links from FileCrypt container", len(links))
+            _parse_cache_put(key, result)
             return result
 
         except Exception as e:
-            logger.error(f"Failed to parse FileCrypt container: {e}")
+            logger.error("Failed to parse FileCrypt container: %s", e)
             raise
 
+    def _fetch_page(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """
+        Download a page, reading at most ``_MAX_PAGE_BYTES`` of its body.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Body bytes (truncated if the page is larger) and the declared charset
+        """
+        with self.session.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=_PAGE_CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= _MAX_PAGE_BYTES:
+                    logger.warning("Page %s exceeds %d bytes, truncated", url, _MAX_PAGE_BYTES)
+                    break
+            return b"".join(chunks)[:_MAX_PAGE_BYTES], _declared_charset(response)
+
+    def _scan_filecrypt_page(
+        self,
+        content: bytes,
+        url: str,
+        encoding: Optional[str] = None,
+    ) -> "_FileCryptPage":
+        """
+        Collect everything the FileCrypt workflow needs in one pass over the page.
+
+        With lxml installed the page bytes are streamed through lxml's HTML
+        parser with a target that feeds the collector directly, so no tree is
+        built at all. Without lxml, BeautifulSoup's html.parser is used.
+
+        Args:
+            content: Raw container page
+            url: Container page URL (base for relative links)
+            encoding: Charset declared by the server; sniffed from the page when None
+
+        Returns:
+            Page findings
+        """
+        page = _FileCryptPage(url)
+
+        if lxml is not None:
+            try:
+                parser = lxml.etree.HTMLParser(target=_FileCryptTarget(page), encoding=encoding)
+            except LookupError:
+                # Charset Python knows but libxml2 does not; sniff it instead
+                parser = lxml.etree.HTMLParser(target=_FileCryptTarget(page))
+            parser.feed(content)
+            return parser.close()
+
+        soup = BeautifulSoup(content, "html.parser", from_encoding=encoding)
+        for el in soup.find_all(_FileCryptPage.TAGS):
+            attrs = {
+                key: " ".join(value) if isinstance(value, list) else value
+                for key, value in el.attrs.items()
+            }
+            page.element(el.name, attrs)
+            if el.name in _FileCryptPage.TEXT_TAGS:
+                page.text(el.name, el.get_text())
+        return page
+
     def resolve_redirect_link(self, redirect_url: str) -> Optional[str]:
         """
         Resolve FileCrypt /Link/ redirect to actual download URL.
@@ -223,45 +324,61 @@ class LinkGrabberService:
             Actual download URL or None
         """
         try:
-            # Follow redirect
-            response = self.session.head(redirect_url, allow_redirects=True, timeout=10)
+            # HEAD is cheapest, but many hosters answer it with 405 or an
+            # unredirected HTML page; only then follow with a streamed GET
+            # that is closed without reading the body
+            response = self.session.head(redirect_url, allow_redirects=True, timeout=5)
             final_url = response.url
+            if response.status_code >= 400 or not _RE_HOSTER.search(final_url):
+                with self.session.get(
+                    redirect_url, allow_redirects=True, timeout=10, stream=True
+                ) as response:
+                    final_url = response.url
 
             # Check if it's a valid download URL
-            hosters = ["rapidgator", "uploaded", "ddownload", "nitro", "ddl", "mega", "mediafire"]
-            if any(hoster in final_url.lower() for hoster in hosters):
-                logger.info(f"Resolved redirect: {redirect_url} -> {final_url}")
+            if _RE_HOSTER.search(final_url):
+                logger.info("Resolved redirect: %s -> %s", redirect_url, final_url)
                 return final_url
 
             return None
         except Exception as e:
-            logger.error(f"Failed to resolve redirect {redirect_url}: {e}")
+            logger.error("Failed to resolve redirect %s: %s", redirect_url, e)
             return None
 
+    def resolve_redirect_links(self, redirect_urls: List[str]) -> List[Optional[str]]:
+        """
+        Resolve several FileCrypt /Link/ redirects concurrently.
+
+        Requests share the session's keep-alive pool, so latency is roughly
+        that of the slowest redirect instead of the sum of all of them.
+
+        Args:
+            redirect_urls: FileCrypt redirect URLs
+
+        Returns:
+            Actual download URLs (None where a redirect could not be resolved),
+            in the order of ``redirect_urls``
+        """
+        if not redirect_urls:
+            return []
+        workers = min(len(redirect_urls), _RESOLVE_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.resolve_redirect_link, redirect_urls))
+
     def _parse_generic(self, url: str) -> Dict[str, any]:
         """Generic link extraction from any URL."""
         try:
-            logger.info(f"Parsing generic URL: {url}")
-
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Extract all links
-            links = []
-            for a_tag in soup.find_all("a", href=True):
-                href = a_tag["href"]
-                if href.startswith("http"):
-                    links.append(href)
+            logger.info("Parsing generic URL: %s", url)
 
-            # Filter for known file hosters
-            valid_links = []
-            hosters = ["rapidgator", "uploaded", "ddownload", "nitro", "ddl", "mega", "mediafire"]
-            for link in links:
-                if any(hoster in link.lower() for hoster in hosters):
-                    valid_links.append(link)
+            content, encoding = self._fetch_page(url)
+            soup = BeautifulSoup(content, _HTML_PARSER, from_encoding=encoding)
 
-            links = list(set(valid_links))
+            # Extract absolute links to known file hosters, dropping duplicates in order
+            links = list(dict.fromkeys(
+                a_tag["href"]
+                for a_tag in soup.select('a[href^="http"]')
+                if _RE_HOSTER.search(a_tag["href"])
+            ))
 
             return {
                 "source": "generic",
@@ -274,5 +391,140 @@ class LinkGrabberService:
             }
 
         except Exception as e:
-            logger.error(f"Failed to parse generic URL: {e}")
+            logger.error("Failed to parse generic URL: %s", e)
             raise
+
+
+class _FileCryptPage:
+    """
+    Findings of a FileCrypt container page, fed element by element.
+
+    Elements are reported in document order with plain string attributes
+    (multi-valued ``class`` joined by spaces); the text of ``TEXT_TAGS``
+    elements is reported separately.
+    """
+
+    # Elements whose text content is inspected
+    TEXT_TAGS = frozenset({"h1", "title", "script"})
+
+    # All elements the page is scanned for
+    TAGS = frozenset({"input", "div", "iframe", "button", "a"}) | TEXT_TAGS
+
+    def __init__(self, url: str):
+        self.url = url
+        parsed = urlparse(url)
+        self._origin = f"{parsed.scheme}://{parsed.netloc}"
+        self._h1: Optional[str] = None
+        self._title: Optional[str] = None
+        self.requires_password = False
+        self._recaptcha = False
+        self._cutcaptcha = False
+        self.cnl_available = False
+        self.dlc_url: Optional[str] = None
+        # Insertion-ordered set: duplicates are dropped as links are found
+        self.links: Dict[str, None] = {}
+
+    @property
+    def name(self) -> Optional[str]:
+        """Container name: the first heading, else the page title."""
+        return self._h1 if self._h1 is not None else self._title
+
+    @property
+    def captcha_type(self) -> Optional[str]:
+        """Captcha the page asks for (CutCaptcha wins when both are present)."""
+        if self._cutcaptcha:
+            return "cutcaptcha"
+        if self._recaptcha:
+            return "recaptcha_v2"
+        return None
+
+    def element(self, tag: str, attrs: Dict[str, str]) -> None:
+        """Inspect one element."""
+        if tag == "input":
+            if attrs.get("name") == "password":
+                self.requires_password = True
+
+        elif tag == "div":
+            classes = attrs.get("class", "")
+            if "g-recaptcha" in classes.split():
+                self._recaptcha = True
+            # Mirror containers (rapidgator, uploaded, etc.) carry the URL in data attributes
+            lowered = classes.lower()
+            if "mirror" in lowered or "link" in lowered:
+                for attr in ("data-href", "data-url", "data-link"):
+                    link_url = attrs.get(attr)
+                    if link_url and link_url.startswith("http"):
+                        self.links[link_url] = None
+
+        elif tag == "iframe":
+            if _RE_CUTCAPTCHA.search(attrs.get("src", "")):
+                self._cutcaptcha = True
+
+        elif tag == "button":
+            # FileCrypt's main method: <button data-XXXX="link_id" onclick="openLink(...)">
+            if "download" in attrs.get("class", "").split():
+                # The first non-empty data-* attribute holds the link ID
+                link_id = next(
+                    (value for attr, value in attrs.items() if attr[:5] == "data-" and value),
+                    None,
+                )
+                if link_id:
+                    full_url = f"{self._origin}/Link/{link_id}.html"
+                    self.links[full_url] = None
+                    logger.debug("Found FileCrypt link: %s", full_url)
+
+        elif tag == "a":
+            href = attrs.get("href", "")
+            if "/Link/" in href and _RE_LINK_REDIRECT.search(href):
+                # /Link/ URLs redirect to the actual download hoster; keep them as-is
+                self.links[self._absolute(href)] = None
+            if self.dlc_url is None and href and _RE_DLC.search(href):
+                self.dlc_url = self._absolute(href)
+
+    def _absolute(self, href: str) -> str:
+        """Resolve a link against the page URL, parsing the page URL only for relative paths."""
+        if href.startswith(("http://", "https://")):
+            return href
+        if href.startswith("/") and not href.startswith("//"):
+            return self._origin + href
+        return urljoin(self.url, href)
+
+    def text(self, tag: str, text: str) -> None:
+        """Inspect the text content of a ``TEXT_TAGS`` element."""
+        if tag == "h1":
+            if self._h1 is None:
+                self._h1 = text.strip()
+        elif tag == "title":
+            if self._title is None:
+                self._title = text.strip()
+        elif tag == "script":
+            # CNL (Click'n'Load): encrypted link data in the page (CNL2: crypted, jk, source)
+            if not self.cnl_available and _RE_CRYPTED.search(text):
+                self.cnl_available = True
+
+
+class _FileCryptTarget:
+    """lxml parser target streaming start/data/end events into a ``_FileCryptPage``."""
+
+    def __init__(self, page: _FileCryptPage):
+        self.page = page
+        # Open TEXT_TAGS elements with their text collected so far
+        self._open: List[tuple] = []
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag in _FileCryptPage.TAGS:
+            self.page.element(tag, attrib)
+            if tag in _FileCryptPage.TEXT_TAGS:
+                self._open.append((tag, []))
+
+    def data(self, data: str) -> None:
+        for _, parts in self._open:
+            parts.append(data)
+
+    def end(self, tag: str) -> None:
+        if self._open and self._open[-1][0] == tag:
+            _, parts = self._open.pop()
+            self.page.text(tag, "".join(parts))
+
+    def close(self) -> _FileCryptPage:
+        return self.page
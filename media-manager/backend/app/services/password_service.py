@@ -0,0 +1,70 @@
+"""Archive password statistics service."""
+
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import ArchivePassword
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordService:
+    """Service for learning which archive passwords work."""
+
+    def __init__(self, db: Session):
+        """
+        Initialize password service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def record_success(self, password: str, source: str = "auto") -> None:
+        """
+        Count a successful extraction with a password, learning it if unknown.
+
+        Args:
+            password: Archive password
+            source: Source recorded for newly learned passwords
+        """
+        self._upsert(password, source, success_count=1, fail_count=0, counter="success_count")
+
+    def record_failure(self, password: str, source: str = "auto") -> None:
+        """
+        Count a failed extraction attempt with a password.
+
+        Args:
+            password: Archive password
+            source: Source recorded for newly learned passwords
+        """
+        self._upsert(password, source, success_count=0, fail_count=1, counter="fail_count")
+
+    def _upsert(
+        self,
+        password: str,
+        source: str,
+        success_count: int,
+        fail_count: int,
+        counter: str,
+    ) -> None:
+        """Insert the password or bump one of its counters in a single statement."""
+        stmt = sqlite_insert(ArchivePassword).values(
+            password=password,
+            success_count=success_count,
+            fail_count=fail_count,
+            source=source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArchivePassword.password],
+            set_={
+                counter: getattr(ArchivePassword, counter) + 1,
+                # Core upserts skip ORM onupdate hooks
+                "updated_at": func.now(),
+            },
+        )
+        self.db.execute(stmt)
+        self.db.commit()
@@ -0,0 +1,49 @@
+"""Interned file path service."""
+
+import logging
+from typing import Dict, Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import FilePath
+
+logger = logging.getLogger(__name__)
+
+
+class PathService:
+    """Service for storing file paths once in the ``paths`` table."""
+
+    def __init__(self, db: Session):
+        """
+        Initialize path service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def intern(self, values: Iterable[str]) -> Dict[str, FilePath]:
+        """
+        Look up the rows of file paths, inserting the unknown ones.
+
+        Runs one INSERT OR IGNORE and one SELECT in the caller's transaction
+        (nothing is committed).
+
+        Args:
+            values: File paths (duplicates are fine)
+
+        Returns:
+            Path row by file path
+        """
+        unique = set(values)
+        if not unique:
+            return {}
+
+        self.db.execute(
+            sqlite_insert(FilePath).on_conflict_do_nothing(index_elements=[FilePath.value]),
+            [{"value": value} for value in unique],
+        )
+        paths = self.db.scalars(select(FilePath).where(FilePath.value.in_(unique)))
+        return {path.value: path for path in paths}
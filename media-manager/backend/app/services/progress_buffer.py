@@ -0,0 +1,121 @@
+"""In-memory buffer for volatile download progress, flushed to the database periodically."""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, FrozenSet, List
+
+from sqlalchemy import bindparam, text, update
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.models import Download
+
+logger = logging.getLogger(__name__)
+
+# Seconds between database flushes
+FLUSH_INTERVAL = 1.0
+
+
+class ProgressBuffer:
+    """Latest progress fields per download, waiting to be written."""
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, download_id: int, fields: Dict[str, Any]) -> None:
+        """
+        Record the latest progress fields of a download.
+
+        Args:
+            download_id: Download ID
+            fields: Column values to write on the next flush
+        """
+        with self._lock:
+            self._pending.setdefault(download_id, {}).update(fields)
+
+    def discard(self, download_id: int) -> None:
+        """
+        Drop buffered fields of a download (written or deleted elsewhere).
+
+        Args:
+            download_id: Download ID
+        """
+        with self._lock:
+            self._pending.pop(download_id, None)
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """
+        Take all buffered entries.
+
+        Returns:
+            Bulk UPDATE parameter sets (``id`` plus the buffered columns)
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return [{"id": download_id, **fields} for download_id, fields in pending.items()]
+
+
+# Global instance
+progress_buffer = ProgressBuffer()
+
+
+def flush_progress() -> int:
+    """
+    Write buffered progress to the database.
+
+    Buffers are per process (API workers, Celery worker), so a tick buffered
+    here may arrive after another process committed a status transition.
+    Rows are therefore only written while the download is still active.
+
+    Returns:
+        Number of downloads written
+    """
+    from app.services.download_service import ACTIVE_DOWNLOAD_STATUSES
+
+    rows = progress_buffer.drain()
+    if not rows:
+        return 0
+
+    # One executemany per column set; deleted or finished downloads match no row
+    batches: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+    for row in rows:
+        fields = frozenset(row) - {"id"}
+        batches.setdefault(fields, []).append(
+            {"b_id": row["id"], **{name: row[name] for name in fields}}
+        )
+
+    downloads = Download.__table__
+    # Inline codes: expanding IN parameters cannot be used with executemany
+    still_active = text(downloads.c.status.type.sql_in("status", *sorted(ACTIVE_DOWNLOAD_STATUSES)))
+    db = SessionLocal()
+    try:
+        written = 0
+        for fields, params in batches.items():
+            stmt = (
+                update(downloads)
+                .where(downloads.c.id == bindparam("b_id"), still_active)
+                .values({name: bindparam(name) for name in fields})
+            )
+            written += db.execute(stmt, params).rowcount
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to flush progress of %d downloads: %s", len(rows), e)
+        return 0
+    finally:
+        SessionLocal.remove()
+    return written
+
+
+async def run_progress_flusher(interval: float = FLUSH_INTERVAL) -> None:
+    """Flush the progress buffer every ``interval`` seconds until cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await run_in_threadpool(flush_progress)
+    finally:
+        # Persist whatever is left on shutdown
+        await run_in_threadpool(flush_progress)
@@ -0,0 +1,34 @@
+"""Celery application configuration."""
+
+from celery import Celery
+
+from app.config import settings
+
+celery_app = Celery(
+    "media_manager",
+    broker=settings.redis_url,
+    backend=settings.redis_url,
+    include=["app.workers.container_worker", "app.workers.download_worker"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone=settings.tz,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    worker_concurrency=settings.celery_workers,
+    broker_connection_retry_on_startup=True,
+    broker_connection_timeout=2,
+    # Task results are never read back
+    task_ignore_result=True,
+    beat_schedule={
+        # Keep download progress current even when no client is polling
+        "refresh-downloads": {
+            "task": "refresh_downloads",
+            "schedule": 5.0,
+            "options": {"expires": 5.0},
+        },
+    },
+)
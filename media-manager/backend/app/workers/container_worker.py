@@ -0,0 +1,70 @@
+"""Container background tasks."""
+
+import logging
+from typing import List, Optional
+
+from app.database import SessionLocal
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="extract_container")
+def extract_container(
+    container_id: int,
+    premium_account_id: Optional[int] = None,
+    custom_name: Optional[str] = None,
+    custom_folder: Optional[str] = None,
+) -> None:
+    """
+    Extract links of a container and create its downloads.
+
+    Args:
+        container_id: Container ID
+        premium_account_id: Optional premium account to use for downloads
+        custom_name: Optional custom name for the container
+        custom_folder: Optional custom folder name
+    """
+    from app.services.container_service import ContainerService
+
+    db = SessionLocal()
+    try:
+        container = ContainerService(db).extract_container_links(
+            container_id,
+            premium_account_id=premium_account_id,
+            custom_name=custom_name,
+            custom_folder=custom_folder,
+        )
+        if container is None:
+            logger.warning("Container %s no longer exists, skipping extraction", container_id)
+    finally:
+        SessionLocal.remove()
+
+
+@celery_app.task(name="submit_container_links")
+def submit_container_links(
+    container_id: int,
+    urls: List[str],
+    premium_account_id: Optional[int] = None,
+) -> None:
+    """
+    Create the downloads of a manual container and submit them to aria2c.
+
+    Args:
+        container_id: Container ID
+        urls: List of download URLs
+        premium_account_id: Optional premium account to use
+    """
+    from app.services.container_service import ContainerService
+
+    db = SessionLocal()
+    try:
+        container = ContainerService(db).submit_container_links(
+            container_id,
+            urls,
+            premium_account_id=premium_account_id,
+        )
+        if container is None:
+            logger.warning("Container %s no longer exists, skipping submission", container_id)
+    finally:
+        SessionLocal.remove()
@@ -0,0 +1,31 @@
+"""Download background tasks."""
+
+import logging
+
+from app.database import SessionLocal
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="refresh_downloads")
+def refresh_downloads() -> int:
+    """
+    Sync all active downloads from aria2c.
+
+    Returns:
+        Number of downloads refreshed
+    """
+    from app.services.download_service import DownloadService
+    from app.services.progress_buffer import flush_progress
+
+    db = SessionLocal()
+    try:
+        count = DownloadService(db).refresh_all_active()
+    finally:
+        SessionLocal.remove()
+
+    # Worker processes have no periodic flusher; write progress right away.
+    # The flush skips downloads another process has since finished or paused.
+    flush_progress()
+    return count
@@ -0,0 +1,7 @@
+"""Shared test configuration."""
+
+import os
+
+# Settings are read at import time; keep tests off the production database
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
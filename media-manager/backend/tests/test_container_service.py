@@ -0,0 +1,168 @@
+"""Tests for container status bookkeeping."""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers all tables)
+from app.database import Base
+from app.models import Container, Download, DownloadStatus
+from app.services import container_service
+from app.services.container_service import ContainerService
+from app.services.download_service import INVALID_URL_ERROR
+
+
+class FakeAria2:
+    """Accepts every URL and hands out sequential GIDs."""
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+
+    def add_downloads_bulk(self, urls, options=None):
+        self.added.extend(urls)
+        return [f"gid{len(self.added) - len(urls) + i}" for i in range(len(urls))]
+
+    def remove_download(self, gid, force=False):
+        self.removed.append(gid)
+        return True
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(container_service, "invalidate", lambda *keys: None)
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def service(db):
+    service = ContainerService(db)
+    service.download_service.aria2 = FakeAria2()
+    return service
+
+
+def fail_first_commit(db, monkeypatch):
+    """Make the next commit fail; later commits go through."""
+    commit = db.commit
+    calls = []
+
+    def flaky_commit():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        commit()
+
+    monkeypatch.setattr(db, "commit", flaky_commit)
+
+
+def make_container(db, total_links):
+    container = Container(
+        name="Pack", source="manual", folder_name="Pack", total_links=total_links, status="pending"
+    )
+    db.add(container)
+    db.commit()
+    return container
+
+
+def test_rejected_urls_are_stored_as_failed_downloads(db, service):
+    container = make_container(db, total_links=2)
+
+    service.submit_container_links(container.id, ["http://rapidgator.net/a", "not a url"])
+
+    downloads = db.query(Download).order_by(Download.id).all()
+    assert [d.status for d in downloads] == [
+        DownloadStatus.QUEUED.value,
+        DownloadStatus.FAILED.value,
+    ]
+    assert downloads[1].error_message == INVALID_URL_ERROR
+    assert service.download_service.aria2.added == ["http://rapidgator.net/a"]
+    assert (container.status, container.failed_links) == ("active", 1)
+
+
+def test_status_refresh_keeps_rejected_links_counted(db, service):
+    container = make_container(db, total_links=2)
+    service.submit_container_links(container.id, ["http://rapidgator.net/a", "ftp//broken"])
+
+    service.update_container_status(container.id)
+    assert (container.status, container.completed_links, container.failed_links) == (
+        "active", 0, 1
+    )
+
+    valid = db.query(Download).filter(Download.aria2_gid.is_not(None)).one()
+    valid.status = DownloadStatus.COMPLETED.value
+    db.commit()
+
+    service.update_container_status(container.id)
+    assert (container.status, container.completed_links, container.failed_links) == (
+        "completed", 1, 1
+    )
+
+
+def test_bulk_refresh_matches_single_refresh(db, service):
+    container = make_container(db, total_links=2)
+    service.submit_container_links(container.id, ["http://rapidgator.net/a", "bad"])
+    db.query(Download).filter(Download.aria2_gid.is_not(None)).one().status = "completed"
+    db.commit()
+
+    service.bulk_update_statuses([container])
+
+    assert (container.status, container.completed_links, container.failed_links) == (
+        "completed", 1, 1
+    )
+
+
+def test_bulk_refresh_skips_unchanged_containers(db, service):
+    container = make_container(db, total_links=1)
+    service.submit_container_links(container.id, ["http://rapidgator.net/a"])
+    service.bulk_update_statuses([container])
+
+    statements = []
+    event.listen(
+        db.get_bind(), "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    service.bulk_update_statuses([container])
+
+    assert container.status == "active"
+    assert not [statement for statement in statements if statement.startswith("UPDATE")]
+
+
+def test_failed_commit_removes_submitted_downloads(db, service, monkeypatch):
+    container = make_container(db, total_links=2)
+    fail_first_commit(db, monkeypatch)
+
+    with pytest.raises(RuntimeError):
+        service.submit_container_links(
+            container.id, ["http://rapidgator.net/a", "http://rapidgator.net/b"]
+        )
+
+    assert service.download_service.aria2.removed == ["gid0", "gid1"]
+    assert db.query(Download).count() == 0
+    assert container.status == "failed"
+
+
+def test_failed_bulk_add_removes_submitted_downloads(db, service, monkeypatch):
+    fail_first_commit(db, monkeypatch)
+
+    with pytest.raises(RuntimeError):
+        service.download_service.bulk_add_downloads(["http://rapidgator.net/a", "bad"])
+
+    assert service.download_service.aria2.removed == ["gid0"]
+    assert db.query(Download).count() == 0
+
+
+def test_container_with_downloads_loads_file_paths(db, service):
+    container = make_container(db, total_links=1)
+    service.submit_container_links(container.id, ["http://rapidgator.net/a"])
+    db.expunge_all()
+
+    loaded = service.get_container(container.id, with_downloads=True)
+
+    assert [d.file_path for d in loaded.downloads] == [None]
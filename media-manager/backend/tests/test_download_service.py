@@ -0,0 +1,78 @@
+"""Tests for syncing downloads from aria2c."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers all tables)
+from app.database import Base
+from app.models import Download, DownloadStatus, FilePath
+from app.services import download_service
+from app.services.download_service import DownloadService
+from app.services.path_service import PathService
+
+
+class FakeAria2:
+    """Reports every download as complete at the given path."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_download_statuses(self, gids):
+        return {
+            gid: {"status": "complete", "name": "x.mkv", "files": [{"path": self.path}]}
+            for gid in gids
+        }
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # No Redis in tests: every refresh asks aria2c
+    monkeypatch.setattr(download_service, "get_many", lambda keys: {})
+    monkeypatch.setattr(download_service, "set_many", lambda values, ttl=5: None)
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+    engine.dispose()
+
+
+def make_downloads(db, count):
+    downloads = [
+        Download(url=f"http://rapidgator.net/{i}", aria2_gid=f"gid{i}",
+                 status=DownloadStatus.DOWNLOADING.value)
+        for i in range(count)
+    ]
+    db.add_all(downloads)
+    db.commit()
+    return downloads
+
+
+def test_intern_returns_one_row_per_path(db):
+    service = PathService(db)
+    first = service.intern(["/downloads/a.mkv", "/downloads/a.mkv", "/downloads/b.mkv"])
+    again = service.intern(["/downloads/a.mkv"])
+
+    assert sorted(first) == ["/downloads/a.mkv", "/downloads/b.mkv"]
+    assert again["/downloads/a.mkv"].id == first["/downloads/a.mkv"].id
+    assert db.query(FilePath).count() == 2
+
+
+def test_completed_downloads_share_an_interned_path(db):
+    downloads = make_downloads(db, 2)
+    service = DownloadService(db)
+    service.aria2 = FakeAria2("/downloads/incomplete/x.mkv")
+
+    service.refresh_statuses(downloads)
+
+    assert [d.file_path for d in downloads] == ["/downloads/incomplete/x.mkv"] * 2
+    assert db.query(FilePath).count() == 1
+
+    db.expunge_all()
+    stored = db.query(Download).filter(Download.file_path == "/downloads/incomplete/x.mkv")
+    assert [(d.status, d.file_path) for d in stored] == [
+        ("completed", "/downloads/incomplete/x.mkv"),
+    ] * 2
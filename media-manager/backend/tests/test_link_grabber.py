@@ -0,0 +1,167 @@
+"""Tests for the FileCrypt page scanner of the link grabber."""
+
+import pytest
+
+from app.services import link_grabber_service
+from app.services.link_grabber_service import LinkGrabberService
+
+PAGE_URL = "https://filecrypt.cc/Container/ABC123.html"
+
+PASSWORD_PAGE = b"""<!DOCTYPE html>
+<html><head><title>Protected - FileCrypt</title></head>
+<body>
+  <form method="post">
+    <input type="password" name="password"><button type="submit">OK</button>
+  </form>
+</body></html>
+"""
+
+RECAPTCHA_PAGE = b"""<html><head><title>Captcha</title></head>
+<body><h1> My Pack </h1><div class="form g-recaptcha" data-sitekey="abc"></div></body></html>
+"""
+
+CUTCAPTCHA_PAGE = b"""<html><body>
+  <div class="g-recaptcha"></div>
+  <iframe src="https://cutcaptcha.net/captcha/frame.html"></iframe>
+</body></html>
+"""
+
+LINKS_PAGE = b"""<html>
+<head>
+  <title>Ignored Title</title>
+  <script>var x = 1;</script>
+  <script type="text/javascript">
+    var cnl = {crypted: "Q1JZUFRFRA==", jk: "function f(){ return '31323334'; }"};
+  </script>
+</head>
+<body>
+  <h1>Movie.2024.1080p  </h1>
+  <table>
+    <tr><td>
+      <button class="download btn" data-a7c2="" data-f00d="abc123"
+              onclick="openLink(this)">DL</button>
+    </td></tr>
+    <tr><td><button class="download" data-qq="def456">DL</button></td></tr>
+    <tr><td><button class="download" data-f00d="abc123">duplicate</button></td></tr>
+    <tr><td><button class="other" data-x="skip">no</button></td></tr>
+  </table>
+  <a href="/Link/ghi789.html">relative redirect</a>
+  <a href="https://filecrypt.cc/Link/jkl012.html">absolute redirect</a>
+  <a href="/Link/ghi789.html">duplicate redirect</a>
+  <a href="/Link/">no id</a>
+  <div class="mirror-box" data-href="https://rapidgator.net/file/1">mirror</div>
+  <div class="box" data-href="https://rapidgator.net/file/2">not a mirror</div>
+  <a href="/DLC/ABC123.dlc">DLC</a>
+  <a href="/DLC/second.dlc">second DLC</a>
+</body></html>
+"""
+
+PAGES = {
+    "password": PASSWORD_PAGE,
+    "recaptcha": RECAPTCHA_PAGE,
+    "cutcaptcha": CUTCAPTCHA_PAGE,
+    "links": LINKS_PAGE,
+}
+
+
+def scan(content, encoding=None):
+    """Scanner findings as a comparable dict."""
+    page = LinkGrabberService()._scan_filecrypt_page(content, PAGE_URL, encoding)
+    return {
+        "name": page.name,
+        "requires_password": page.requires_password,
+        "captcha_type": page.captcha_type,
+        "cnl_available": page.cnl_available,
+        "dlc_url": page.dlc_url,
+        "links": list(page.links),
+    }
+
+
+@pytest.fixture(params=["lxml", "html.parser"])
+def backend(request, monkeypatch):
+    """Run a test with the lxml target and with the BeautifulSoup fallback."""
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    else:
+        monkeypatch.setattr(link_grabber_service, "lxml", None)
+    return request.param
+
+
+def test_password_page(backend):
+    findings = scan(PASSWORD_PAGE)
+
+    assert findings["requires_password"] is True
+    assert findings["name"] == "Protected - FileCrypt"
+    assert findings["captcha_type"] is None
+    assert findings["links"] == []
+
+
+def test_recaptcha_page(backend):
+    findings = scan(RECAPTCHA_PAGE)
+
+    assert findings["captcha_type"] == "recaptcha_v2"
+    # The heading wins over the title
+    assert findings["name"] == "My Pack"
+    assert findings["requires_password"] is False
+
+
+def test_cutcaptcha_wins_over_recaptcha(backend):
+    assert scan(CUTCAPTCHA_PAGE)["captcha_type"] == "cutcaptcha"
+
+
+def test_links_page(backend):
+    findings = scan(LINKS_PAGE)
+
+    assert findings["name"] == "Movie.2024.1080p"
+    assert findings["cnl_available"] is True
+    assert findings["dlc_url"] == "https://filecrypt.cc/DLC/ABC123.dlc"
+    assert findings["links"] == [
+        "https://filecrypt.cc/Link/abc123.html",
+        "https://filecrypt.cc/Link/def456.html",
+        "https://filecrypt.cc/Link/ghi789.html",
+        "https://filecrypt.cc/Link/jkl012.html",
+        "https://rapidgator.net/file/1",
+    ]
+
+
+def test_page_without_cnl_or_dlc(backend):
+    findings = scan(RECAPTCHA_PAGE)
+
+    assert findings["cnl_available"] is False
+    assert findings["dlc_url"] is None
+
+
+def test_declared_charset(backend):
+    content = "<html><h1>한국어</h1></html>".encode("euc-kr")
+
+    assert scan(content, "EUC-KR")["name"] == "한국어"
+
+
+def test_charset_unknown_to_libxml2_is_sniffed(backend):
+    # Python-only alias; libxml2 raises LookupError for it
+    assert scan(b"<html><h1>Pack</h1></html>", "euc_kr")["name"] == "Pack"
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_backends_agree(name, monkeypatch):
+    pytest.importorskip("lxml")
+    with_lxml = scan(PAGES[name])
+    monkeypatch.setattr(link_grabber_service, "lxml", None)
+
+    assert scan(PAGES[name]) == with_lxml
+
+
+def test_parse_filecrypt_result(monkeypatch):
+    monkeypatch.setattr(link_grabber_service, "_PARSE_CACHE", link_grabber_service.OrderedDict())
+    service = LinkGrabberService()
+    monkeypatch.setattr(service, "_fetch_page", lambda url: (LINKS_PAGE, None))
+
+    result = service._parse_filecrypt(PAGE_URL)
+
+    assert result["name"] == "Movie.2024.1080p"
+    assert result["requires_captcha"] is False
+    assert result["requires_password"] is False
+    assert result["cnl_available"] is True
+    assert result["dlc_url"] == "https://filecrypt.cc/DLC/ABC123.dlc"
+    assert result["links"] == scan(LINKS_PAGE)["links"]
+    assert result["total_links"] == 5
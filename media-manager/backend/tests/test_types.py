@@ -0,0 +1,83 @@
+"""Tests for the custom column types."""
+
+import logging
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+import app.models  # noqa: F401  (registers all tables)
+from app.database import Base
+from app.models import Download, DownloadStatus, Worker, WorkerStatus
+from app.models.types import EnumInt, convert_enum_labels
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_codes_follow_member_order():
+    status_type = EnumInt(DownloadStatus)
+
+    assert status_type.code("pending") == 0
+    assert status_type.code(DownloadStatus.CANCELLED) == 6
+    with pytest.raises(ValueError):
+        status_type.code("bogus")
+
+
+def test_result_value_accepts_codes_stored_as_text():
+    status_type = EnumInt(DownloadStatus)
+
+    assert status_type.process_result_value(3, None) == "completed"
+    assert status_type.process_result_value("3", None) == "completed"
+    assert status_type.process_result_value(None, None) is None
+
+
+def test_result_value_passes_unknown_values_through(caplog):
+    status_type = EnumInt(DownloadStatus)
+
+    with caplog.at_level(logging.WARNING, logger="app.models.types"):
+        assert status_type.process_result_value("bogus", None) == "bogus"
+        assert status_type.process_result_value(99, None) == "99"
+        assert status_type.process_result_value(-1, None) == "-1"
+        assert status_type.process_result_value("bogus", None) == "bogus"
+
+    # Each unknown value is only reported once
+    assert len(caplog.records) == 3
+
+
+def test_convert_enum_labels_rewrites_legacy_labels(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO downloads (id, url, status, updated_at) VALUES "
+            "(1, 'http://a', 'completed', '2024-01-01 00:00:00'), "
+            "(2, 'http://b', 'paused', NULL), "
+            "(3, 'http://c', 'legacy-state', NULL), "
+            "(4, 'http://d', 1, NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO workers (id, name, status) VALUES (1, 'gpu', 'online')"
+        ))
+
+        convert_enum_labels(conn)
+        # Converting twice is a no-op
+        convert_enum_labels(conn)
+
+    with engine.connect() as conn:
+        stored = dict(conn.execute(text("SELECT id, status FROM downloads")).all())
+        updated_at = conn.execute(text("SELECT updated_at FROM downloads WHERE id = 1")).scalar()
+        statuses = dict(conn.execute(select(Download.id, Download.status)).all())
+        worker_status = conn.execute(select(Worker.status)).scalar()
+
+    assert stored == {1: 3, 2: 5, 3: "legacy-state", 4: 1}
+    assert updated_at == "2024-01-01 00:00:00"
+    assert statuses == {
+        1: DownloadStatus.COMPLETED.value,
+        2: DownloadStatus.PAUSED.value,
+        3: "legacy-state",
+        4: DownloadStatus.QUEUED.value,
+    }
+    assert worker_status == WorkerStatus.ONLINE.value
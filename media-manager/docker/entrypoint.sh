@@ -37,12 +37,6 @@ mkdir -p \
     /cache/tmdb \
     /cache/thumbnails
 
-# Initialize database if needed
-if [ ! -f "/config/database.db" ]; then
-    echo "Initializing database..."
-    cd /app/backend && python -c "from app.database import init_db; init_db()"
-fi
-
 # Check for required environment variables
 if [ -z "$SECRET_KEY" ] || [ "$SECRET_KEY" = "change-me-to-a-random-secure-key" ]; then
     echo "WARNING: SECRET_KEY not set or using default. Generating random key..."
@@ -51,6 +45,15 @@ if [ -z "$SECRET_KEY" ] || [ "$SECRET_KEY" = "change-me-to-a-random-secure-key"
     echo "Please save this key and set it in your environment!"
 fi
 
+# Create/update the database schema before any service starts. Run as appuser
+# so new database/WAL files are writable by the services.
+echo "Initializing database..."
+RUN_AS=""
+if [ "$(id -u)" = "0" ]; then
+    RUN_AS="gosu appuser"
+fi
+(cd /app/backend && $RUN_AS python -c "from app.database import init_db; init_db()")
+
 if [ -z "$TMDB_API_KEY" ]; then
     echo "WARNING: TMDB_API_KEY not set. TMDB features will not work."
 fi